@@ -0,0 +1,387 @@
+"""
+Benchmarks of the triage hot paths, run offline against synthetic data.
+
+Usage:
+    python benchmark.py [results.json] [listing_rows] [training_rows]
+    python benchmark.py compare <baseline.json> <results.json>
+
+listing_rows and training_rows are comma-separated row counts (defaults
+10000,100000,1000000 and 1000,10000,100000). Everything runs in a
+temporary directory with its own database and model, so the app's data is
+never touched. Results are written as JSON; `compare` prints the change of
+every measurement between two result files, e.g. from two commits.
+"""
+from itertools import cycle
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DEFAULT_LISTING_ROWS = [10000, 100000, 1000000]
+DEFAULT_TRAINING_ROWS = [1000, 10000, 100000]
+KRR_RULE_COUNTS = [12, 1000]
+# Rows of the synthetic raw vehicle export fed to process_raw_data
+PROCESSING_ROWS = 100000
+
+# Whether a larger value of a measurement is better, by suffix
+HIGHER_IS_BETTER = {'per_second': True, 'seconds': False}
+
+def measure(func, min_seconds=1.0, min_runs=5):
+    """
+    Time repeated calls of func
+
+    Returns:
+        Dict with the number of runs, calls per second and the median and
+        95th percentile latency in seconds
+    """
+    timings = []
+    began = time.perf_counter()
+    while len(timings) < min_runs or time.perf_counter() - began < min_seconds:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        'runs': len(timings),
+        'per_second': len(timings) / sum(timings),
+        'median_seconds': timings[len(timings) // 2],
+        'p95_seconds': timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    }
+
+def synthetic_dataset(n_rows, seed=42):
+    """Training-style DataFrame of n_rows synthetic requests"""
+    from synthetic_data import generate_requests
+
+    return generate_requests(n_rows, seed)[['category', 'description', 'location', 'priority']]
+
+def synthetic_vehicle_export(n_rows, seed=42):
+    """Raw abandoned-vehicle export with gaps and a mix of numeric and text day counts"""
+    import numpy as np
+    import pandas as pd
+    from process_vehicle_dataset import DAYS_PARKED_COLUMN
+
+    rng = np.random.default_rng(seed)
+
+    def with_gaps(values, missing=0.1):
+        values = pd.Series(values, dtype=object)
+        values[rng.random(n_rows) < missing] = None
+        return values
+
+    days = rng.choice([0, 3, 7, 14, 30, 45, 60, 120], n_rows)
+    text_days = rng.random(n_rows) < 0.2
+    days = np.where(text_days, np.char.add(days.astype(str), ' days'), days.astype(str))
+    return pd.DataFrame({
+        'Service Request Number': with_gaps([f'SR-{i:08d}' for i in range(n_rows)], 0.01),
+        'Vehicle Make/Model': with_gaps(rng.choice(['Ford', 'Honda', 'Toyota', 'Chevrolet', 'Nissan'], n_rows)),
+        'Vehicle Color': with_gaps(rng.choice(['Red', 'Blue', 'White', 'Black', 'Silver'], n_rows)),
+        'License Plate': with_gaps(rng.integers(100000, 999999, n_rows).astype(str), 0.3),
+        DAYS_PARKED_COLUMN: with_gaps(days),
+        'Current Activity': with_gaps(rng.choice(['FVI - Outcome', 'Tow Requested', 'Final Outcome'], n_rows)),
+        'Most Recent Action': with_gaps(rng.choice(['Create Work Order', 'Vehicle Removed', 'Hazard reported'], n_rows)),
+        'Street Address': with_gaps(np.char.add(rng.integers(1, 9999, n_rows).astype(str), ' N Clark St'), 0.02),
+        'ZIP Code': with_gaps(rng.choice([60601, 60614, 60640, 60657], n_rows), 0.05),
+        'Ward': with_gaps(rng.integers(1, 51, n_rows), 0.05),
+        'Latitude': rng.uniform(41.6, 42.0, n_rows),
+        'Longitude': rng.uniform(-87.9, -87.5, n_rows)
+    })
+
+def bench_processing(n_rows=PROCESSING_ROWS):
+    """process_raw_data throughput against the row-by-row implementation it replaced"""
+    import contextlib
+    import io
+    import pandas as pd
+    from process_vehicle_dataset import process_chunk_rows, process_raw_data
+
+    input_file = 'benchmark_raw_vehicles.csv'
+    synthetic_vehicle_export(n_rows).to_csv(input_file, index=False)
+
+    def process_rows():
+        process_chunk_rows(pd.read_csv(input_file)).to_csv('benchmark_processed_rows.csv', index=False)
+
+    def process_chunked():
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_raw_data(input_file, 'benchmark_processed.csv')
+
+    results = {}
+    for name, func in [('process_raw_rows', process_rows), ('process_raw_data', process_chunked)]:
+        timing = measure(func, min_seconds=0, min_runs=3)
+        timing['rows_per_second'] = timing['per_second'] * n_rows
+        results[f'{name}_{n_rows}_rows'] = timing
+    return results
+
+def bench_prediction(predictor, records):
+    """Single and batch predict_priority throughput"""
+    single = cycle(records)
+
+    def predict_one():
+        record = next(single)
+        predictor.predict_priority(record['category'], record['description'], record['location'])
+
+    results = {'predict_single': measure(predict_one)}
+    for batch_size in [100, 1000]:
+        batch = records[:batch_size]
+        timing = measure(lambda: predictor.predict_priority_batch(batch))
+        timing['rows_per_second'] = timing['per_second'] * batch_size
+        results[f'predict_batch_{batch_size}'] = timing
+    return results
+
+def bench_advisory(records, seed=42):
+    """get_advisory calls per second with the built-in rules and a large rule base"""
+    import numpy as np
+    from krr_engine import KRREngine
+
+    rng = np.random.default_rng(seed)
+    vocabulary = sorted({word.lower().strip(',.') for record in records[:1000] for word in record['description'].split()})
+    categories = sorted({record['category'] for record in records})
+    priorities = ['High', 'Medium', 'Low']
+
+    results = {}
+    for rule_count in KRR_RULE_COUNTS:
+        engine = KRREngine()
+        for i in range(rule_count - len(engine.rules)):
+            engine.rules.append({
+                'name': f'Synthetic rule {i}',
+                'category': categories[i % len(categories)],
+                'keywords': [f'{word}{i}' for word in rng.choice(vocabulary, 3)],
+                'conditions': [],
+                'action': f'Synthetic action {i}.',
+                'priority': priorities[i % len(priorities)]
+            })
+        engine._compile_rules()
+
+        calls = cycle(records)
+
+        def advise():
+            record = next(calls)
+            engine.get_advisory(record['category'], record['description'], record['location'])
+
+        results[f'advisory_{rule_count}_rules'] = measure(advise)
+    return results
+
+def bench_training(predictor, training_rows):
+    """train_model wall time by dataset size"""
+    # Untimed run first, so the first measurement does not include imports
+    predictor.train_model(df=synthetic_dataset(100))
+    results = {}
+    for n_rows in training_rows:
+        df = synthetic_dataset(n_rows)
+        start = time.perf_counter()
+        predictor.train_model(df=df)
+        results[f'train_{n_rows}_rows'] = {'seconds': time.perf_counter() - start}
+    return results
+
+def bench_app(records, listing_rows):
+    """/submit throughput and /requests and /admin render times by table size"""
+    from app import app, db, migrate_database, ServiceRequest
+    from synthetic_data import insert_requests
+
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        migrate_database()
+
+    submissions = cycle(records)
+
+    def submit():
+        record = next(submissions)
+        response = client.post('/submit', data=record)
+        assert response.status_code == 200, response.status_code
+
+    results = {'submit': measure(submit)}
+
+    with app.app_context():
+        inserted = ServiceRequest.query.count()
+    for n_rows in sorted(listing_rows):
+        if n_rows > inserted:
+            with app.app_context():
+                insert_requests(n_rows - inserted, seed=n_rows, days=90)
+            inserted = n_rows
+
+        for name, url in [('requests', '/requests'), ('requests_by_priority', '/requests?sort=priority'),
+                          ('admin', '/admin'), ('admin_high', '/admin?priority=High')]:
+            def render():
+                response = client.get(url)
+                assert response.status_code == 200, response.status_code
+
+            results[f'render_{name}_{n_rows}_rows'] = measure(render, min_runs=3)
+    return results
+
+def concurrent_writer(records, seconds, seed):
+    """
+    One writer process of bench_concurrent_writes
+
+    Returns:
+        Tuple of (completed writes, failed writes, write latencies)
+    """
+    import random
+    from app import app, ml_predictor
+
+    ml_predictor.ensure_model()
+    client = app.test_client()
+    rng = random.Random(seed)
+    submitted = []
+    writes, errors, timings = 0, 0, []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if submitted and rng.random() < 0.5:
+            response = client.post(f'/request/{rng.choice(submitted)}/update_status',
+                                   json={'status': rng.choice(['Pending', 'In-Progress', 'Completed'])})
+        else:
+            response = client.post('/submit', data=rng.choice(records))
+            if response.status_code == 200:
+                submitted.append(response.get_json()['request_id'])
+        timings.append(time.perf_counter() - start)
+        if response.status_code == 200:
+            writes += 1
+        else:
+            errors += 1
+    return writes, errors, timings
+
+def bench_concurrent_writes(records, workers=8, seconds=5.0):
+    """Mixed /submit and update_status traffic from several worker processes on one database"""
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    # Spawned workers import the app afresh with the benchmark environment
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        outcomes = list(pool.map(concurrent_writer, [records[:1000]] * workers, [seconds] * workers, range(workers)))
+
+    timings = sorted(timing for _, _, worker_timings in outcomes for timing in worker_timings)
+    writes = sum(outcome[0] for outcome in outcomes)
+    return {f'concurrent_writes_{workers}_workers': {
+        'per_second': writes / seconds,
+        'errors': sum(outcome[1] for outcome in outcomes),
+        'median_seconds': timings[len(timings) // 2],
+        'p95_seconds': timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    }}
+
+def git_commit():
+    """Commit the benchmark ran against, if this is a git checkout"""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(listing_rows=None, training_rows=None):
+    """
+    Run all benchmarks in a temporary working directory
+
+    Args:
+        listing_rows: Table sizes for the /requests and /admin render times
+        training_rows: Dataset sizes for the train_model wall times
+
+    Returns:
+        Dict with run metadata and a 'results' dict of measurements
+    """
+    listing_rows = listing_rows or DEFAULT_LISTING_ROWS
+    training_rows = training_rows or DEFAULT_TRAINING_ROWS
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': {}
+    }
+
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, source_dir)
+    with tempfile.TemporaryDirectory(prefix='triage-benchmark-') as work_dir:
+        # The app reads its settings on import; keep its database, model and
+        # uploads inside the temporary directory and the model uncached
+        dataset_path = os.path.join(work_dir, 'benchmark_dataset.csv')
+        os.environ.update({
+            'DATABASE_URL': 'sqlite:///' + os.path.join(work_dir, 'benchmark.db'),
+            'DATASET_PATH': dataset_path,
+            'MODEL_LOADING': 'lazy',
+            'PREDICTION_CACHE_SIZE': '0',
+            'ASYNC_TRIAGE': '0'
+        })
+        previous_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            from ml_model import MLPriorityPredictor
+
+            dataset = synthetic_dataset(10000)
+            dataset.to_csv(dataset_path, index=False)
+            records = dataset[['category', 'description', 'location']].to_dict('records')
+
+            predictor = MLPriorityPredictor(dataset_path=dataset_path)
+            print("Benchmarking train_model...")
+            report['results'].update(bench_training(predictor, training_rows))
+            # The remaining benchmarks use a model trained on the 10k dataset
+            predictor.train_model()
+
+            print("Benchmarking predict_priority...")
+            report['results'].update(bench_prediction(predictor, records))
+            print("Benchmarking get_advisory...")
+            report['results'].update(bench_advisory(records))
+            print("Benchmarking process_raw_data...")
+            report['results'].update(bench_processing())
+            print("Benchmarking /submit, /requests and /admin...")
+            report['results'].update(bench_app(records, listing_rows))
+            print("Benchmarking concurrent writers...")
+            report['results'].update(bench_concurrent_writes(records))
+        finally:
+            os.chdir(previous_dir)
+    return report
+
+def compare(baseline, current):
+    """
+    Relative change of every measurement present in both reports
+
+    Returns:
+        List of (benchmark, metric, baseline value, current value, change)
+        tuples, where a positive change is an improvement
+    """
+    rows = []
+    for name, metrics in sorted(current['results'].items()):
+        for metric, value in sorted(metrics.items()):
+            old = baseline['results'].get(name, {}).get(metric)
+            if not old or metric == 'runs':
+                continue
+            higher_is_better = HIGHER_IS_BETTER['per_second' if metric.endswith('per_second') else 'seconds']
+            change = (value - old) / old if higher_is_better else (old - value) / old
+            rows.append((name, metric, old, value, change))
+    return rows
+
+def parse_row_counts(value):
+    return [int(count) for count in value.split(',') if count.strip()]
+
+def main(argv):
+    if len(argv) > 1 and argv[1] == 'compare':
+        if len(argv) != 4:
+            print("Usage: python benchmark.py compare <baseline.json> <results.json>")
+            return 1
+        with open(argv[2]) as f:
+            baseline = json.load(f)
+        with open(argv[3]) as f:
+            current = json.load(f)
+        print(f"{baseline.get('commit')} -> {current.get('commit')}")
+        for name, metric, old, value, change in compare(baseline, current):
+            print(f"{name:40} {metric:18} {old:12.4g} {value:12.4g} {change:+8.1%}")
+        return 0
+
+    output_file = argv[1] if len(argv) > 1 else 'benchmark_results.json'
+    listing_rows = parse_row_counts(argv[2]) if len(argv) > 2 else None
+    training_rows = parse_row_counts(argv[3]) if len(argv) > 3 else None
+
+    report = run_benchmarks(listing_rows, training_rows)
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, metrics in report['results'].items():
+        summary = ', '.join(f"{metric}={value:.4g}" for metric, value in metrics.items() if metric != 'runs')
+        print(f"{name}: {summary}")
+    print(f"Saved to: {output_file}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
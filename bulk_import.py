@@ -0,0 +1,129 @@
+"""
+Bulk import of service requests from CSV/JSONL exports.
+
+Records are read in chunks, each chunk is scored with a single ML model call
+and written with one bulk insert per transaction.
+"""
+import os
+import sys
+from datetime import datetime
+from ml_model import detect_column_map
+
+DEFAULT_CHUNK_SIZE = 1000
+
+SUPPORTED_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.json': 'json',
+    '.xlsx': 'excel',
+    '.xls': 'excel'
+}
+
+# Optional columns copied as-is when present in the source file
+PASSTHROUGH_COLUMNS = ['name', 'status', 'created_at']
+
+VALID_STATUSES = ['Pending', 'In-Progress', 'Completed']
+
+def detect_format(filename):
+    """Determine the import format from a file name, or None if unsupported"""
+    return SUPPORTED_FORMATS.get(os.path.splitext(filename)[1].lower())
+
+def _read_chunks(source, file_format, chunk_size):
+    """Yield raw DataFrame chunks from a file path or file-like object"""
+    import pandas as pd
+
+    if file_format == 'csv':
+        yield from pd.read_csv(source, chunksize=chunk_size)
+    elif file_format == 'jsonl':
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size)
+    else:
+        # JSON arrays and Excel workbooks cannot be streamed; read once and slice
+        df = pd.read_json(source) if file_format == 'json' else pd.read_excel(source)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+def _normalize_chunk(df):
+    """Map a raw chunk onto ServiceRequest fields and return it as a list of dicts"""
+    import pandas as pd
+
+    df.columns = df.columns.astype(str).str.strip()
+    df = df.rename(columns={v: k for k, v in detect_column_map(df.columns).items()})
+    df = df.rename(columns={col: col.lower() for col in df.columns if col.lower() in PASSTHROUGH_COLUMNS})
+
+    missing_cols = [col for col in ['category', 'description'] if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {missing_cols}. Available columns: {list(df.columns)}")
+
+    df = df.dropna(subset=['category', 'description'])
+    if 'location' not in df.columns:
+        df['location'] = ''
+
+    columns = ['category', 'description', 'location'] + [col for col in PASSTHROUGH_COLUMNS if col in df.columns]
+    df = df[columns].copy()
+
+    for col in ['category', 'description', 'location']:
+        df[col] = df[col].fillna('').astype(str).str.strip()
+    # Every row of a chunk is inserted with the same columns, so fill in the
+    # model defaults here for unknown statuses and unparseable dates
+    if 'status' in df.columns:
+        df['status'] = df['status'].where(df['status'].isin(VALID_STATUSES), 'Pending')
+    if 'created_at' in df.columns:
+        # Naive UTC like the rest of the table; offsets such as "Z" are converted
+        created_at = pd.to_datetime(df['created_at'], errors='coerce', utc=True).dt.tz_convert(None)
+        df['created_at'] = created_at.fillna(pd.Timestamp(datetime.utcnow()))
+
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+def iter_request_chunks(source, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read service request records in chunks
+
+    Args:
+        source: Path or file-like object of a CSV, JSONL, JSON or Excel file
+        file_format: One of the values of SUPPORTED_FORMATS
+        chunk_size: Number of records per chunk
+
+    Yields:
+        Lists of dicts with category, description, location and any passthrough columns
+    """
+    for df in _read_chunks(source, file_format, chunk_size):
+        records = _normalize_chunk(df)
+        if records:
+            yield records
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage:")
+        print("  python bulk_import.py <input_file.csv|.jsonl> [chunk_size]")
+        print("\nExample:")
+        print("  python bulk_import.py backlog.csv 5000")
+        return 1
+
+    input_file = argv[1]
+    chunk_size = int(argv[2]) if len(argv) > 2 else DEFAULT_CHUNK_SIZE
+    file_format = detect_format(input_file)
+
+    if not os.path.exists(input_file):
+        print(f"Input file not found: {input_file}")
+        return 1
+    if file_format is None:
+        print(f"Unsupported file format: {os.path.splitext(input_file)[1]}")
+        return 1
+
+    # Imported lazily so the chunk readers can be used without the web app
+    from app import app, db, import_records
+
+    with app.app_context():
+        db.create_all()
+        total = 0
+        for chunk_number, records in enumerate(iter_request_chunks(input_file, file_format, chunk_size), 1):
+            total += import_records(records)
+            print(f"Chunk {chunk_number}: {total} records imported")
+
+    print(f"\nImport complete: {total} records from {input_file}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
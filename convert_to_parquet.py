@@ -0,0 +1,103 @@
+"""
+Convert CSV/Excel/JSON datasets to Parquet for faster model training.
+
+Usage:
+    python convert_to_parquet.py <dataset.csv|.xlsx|.json> [output.parquet] [chunk_size]
+
+load_dataset reads only the category, description, location and priority
+columns of a Parquet file, so retraining skips parsing everything else.
+All columns are stored as strings: CSV files are converted chunk by chunk
+and every chunk must have the same schema, and load_dataset normalizes the
+values it keeps anyway.
+"""
+import os
+import sys
+
+DEFAULT_CHUNK_SIZE = 100000
+
+def convert_to_parquet(input_file, output_file=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Convert a dataset file to Parquet
+
+    Args:
+        input_file: Path to a CSV, Excel or JSON dataset
+        output_file: Path of the Parquet file; defaults to the input path
+                     with a .parquet extension
+        chunk_size: Rows converted at a time for CSV input
+
+    Returns:
+        Tuple of (output file path, number of rows written)
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    output_file = output_file or os.path.splitext(input_file)[0] + '.parquet'
+    file_ext = os.path.splitext(input_file)[1].lower()
+
+    if file_ext == '.csv':
+        chunks = pd.read_csv(input_file, dtype=str, chunksize=chunk_size)
+    elif file_ext in ['.xlsx', '.xls']:
+        chunks = [pd.read_excel(input_file, dtype=str)]
+    elif file_ext == '.json':
+        chunks = [pd.read_json(input_file).astype('string')]
+    else:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+    # Written to a temporary file first so a failed conversion never
+    # leaves a truncated dataset behind
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    writer = None
+    total = 0
+    try:
+        for chunk in chunks:
+            chunk.columns = chunk.columns.astype(str)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                schema = pa.schema([pa.field(name, pa.string()) for name in table.schema.names])
+                writer = pq.ParquetWriter(tmp_file, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            total += len(chunk)
+
+        if writer is None:
+            raise ValueError(f"No data found in {input_file}")
+        writer.close()
+        writer = None
+        os.replace(tmp_file, output_file)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    return output_file, total
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage:")
+        print("  python convert_to_parquet.py <dataset.csv|.xlsx|.json> [output.parquet] [chunk_size]")
+        print("\nExample:")
+        print("  python convert_to_parquet.py vehicle_dataset.csv")
+        print("  DATASET_PATH=vehicle_dataset.parquet python app.py")
+        return 1
+
+    input_file = argv[1]
+    output_file = argv[2] if len(argv) > 2 else None
+    chunk_size = int(argv[3]) if len(argv) > 3 else DEFAULT_CHUNK_SIZE
+
+    if not os.path.exists(input_file):
+        print(f"Input file not found: {input_file}")
+        return 1
+
+    try:
+        output_file, total = convert_to_parquet(input_file, output_file, chunk_size)
+    except (ValueError, ImportError) as e:
+        print(f"Error converting dataset: {e}")
+        return 1
+
+    print(f"Converted {total} records from {input_file}")
+    print(f"Saved to: {output_file}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,11 +1,62 @@
 """
 Convert the raw vehicle complaint text data into a properly formatted CSV
 for ML model training.
+
+Usage:
+    python convert_vehicle_data.py [raw_export.tsv|.csv] [output.csv]
+
+The export is read and written one row at a time, so files of any size
+are converted in constant memory. Without an input file the sample data
+below is converted.
 """
+import csv
+import io
+import operator
+import os
+import sys
 import pandas as pd
 import re
+from collections import Counter
+
+# Characters stripped from days-parked values before parsing ("90 days" -> 90)
+NON_NUMERIC = re.compile(r'[^\d.]')
+
+DAYS_PARKED_COLUMN = 'How Many Days Has the Vehicle Been Reported as Parked?'
+
+# Output columns and the raw export column each one is copied from
+PASSTHROUGH_COLUMNS = [
+    ('creation_date', 'Creation Date'),
+    ('status', 'Status'),
+    ('completion_date', 'Completion Date'),
+    ('service_request_number', 'Service Request Number'),
+    ('type_of_service_request', 'Type of Service Request'),
+    ('license_plate', 'License Plate'),
+    ('vehicle_make_model', 'Vehicle Make/Model'),
+    ('vehicle_color', 'Vehicle Color'),
+    ('current_activity', 'Current Activity'),
+    ('most_recent_action', 'Most Recent Action'),
+    ('days_parked', None),
+    ('street_address', 'Street Address'),
+    ('zip_code', 'ZIP Code'),
+    ('x_coordinate', 'X Coordinate'),
+    ('y_coordinate', 'Y Coordinate'),
+    ('ward', 'Ward'),
+    ('police_district', 'Police District'),
+    ('community_area', 'Community Area'),
+    ('ssa', 'SSA'),
+    ('latitude', 'Latitude'),
+    ('longitude', 'Longitude'),
+    ('location_full', 'Location'),
+    ('historical_wards_2003_2015', 'Historical Wards 2003-2015'),
+    ('zip_codes', 'Zip Codes'),
+    ('community_areas', 'Community Areas'),
+    ('census_tracts', 'Census Tracts'),
+    ('wards', 'Wards')
+]
+
+OUTPUT_COLUMNS = ['category', 'description', 'location', 'priority'] + [column for column, _ in PASSTHROUGH_COLUMNS]
 
-# Your raw data - paste it here or load from file
+# Sample raw data, converted when no input file is given
 raw_data_text = """Creation Date	Status	Completion Date	Service Request Number	Type of Service Request	License Plate	Vehicle Make/Model	Vehicle Color	Current Activity	Most Recent Action	How Many Days Has the Vehicle Been Reported as Parked?	Street Address	ZIP Code	X Coordinate	Y Coordinate	Ward	Police District	Community Area	SSA	Latitude	Longitude	Location	Historical Wards	2003-2015	Zip Codes	Community Areas	Census Tracts	Wards
 2015-04-08T00:00:00.000	Completed	2015-04-09T00:00:00.000	15-01207496	Abandoned Vehicle Complaint	S48 3272	Bmw	Silver	FVI - Outcome	Vehicle was moved from original address requested	90	3020 N WATERLOO CT	60657	44	19	6	8	41.9370259	-87.64615133	{'latitude': '-87.64615132728282', 'longitude': '41.93702589972641'}
 2016-10-13T00:00:00.000	Completed	2016-11-14T00:00:00.000	16-07176240	Abandoned Vehicle Complaint		FVI - Outcome	Vehicle was moved from original address requested		652 W ROSCOE ST	60657	1171215.844	1922811.93	44	19	6	8	41.94377029	-87.64661331	{'latitude': '-87.64661331410854', 'longitude': '41.943770285359875'}
@@ -27,25 +78,28 @@ raw_data_text = """Creation Date	Status	Completion Date	Service Request Number	T
 2018-01-31T00:00:00.000	Completed - Dup	2018-01-31T00:00:00.000	18-00543031	Abandoned Vehicle Complaint	892T429	Nissan	White	FVI - Outcome	Create Work Order	21	437 W ALDINE AVE	60657	1172478.575	1922312.625	44	19	6	8	41.94216148	-87.64139472	{'latitude': '-87.64139472326463', 'longitude': '41.942161477554265'}
 2016-07-20T00:00:00.000	Completed	2016-08-10T00:00:00.000	16-05098619	Abandoned Vehicle Complaint	DM6008	Honda	Black	FVI - Outcome	Vehicle was moved from original address requested	10	614 W BARRY AVE	60657	1171612.55	1920712.43	44	19	6	8	41.93800371	-87.64497431	{'latitude': '-87.64497431463727', 'longitude': '41.93800370996964'}"""
 
+def parse_days_parked(value):
+    """
+    Parse a days-parked value into an int
+    
+    Non-numeric characters are dropped first; empty, unparseable and
+    implausibly large (over 1000) values count as 0.
+    """
+    if isinstance(value, int):
+        return value if value <= 1000 else 0
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return 0
+    days_clean = NON_NUMERIC.sub('', str(value))
+    try:
+        days = int(float(days_clean)) if days_clean else 0
+    except ValueError:
+        return 0
+    # Sanity check - if days seems too high, it might be a parsing error
+    return days if days <= 1000 else 0
+
 def determine_priority(days_parked, most_recent_action, current_activity):
     """Determine priority based on data"""
-    # Convert days_parked to int
-    try:
-        if pd.isna(days_parked) or days_parked == '' or str(days_parked).strip() == '':
-            days = 0
-        else:
-            days_str = str(days_parked).strip()
-            # Remove non-numeric characters
-            days_clean = re.sub(r'[^\d.]', '', days_str)
-            if days_clean:
-                days = int(float(days_clean))
-                # Sanity check - if days seems too high, it might be a parsing error
-                if days > 1000:
-                    days = 0
-            else:
-                days = 0
-    except:
-        days = 0
+    days = parse_days_parked(days_parked)
     
     action = str(most_recent_action).lower()
     activity = str(current_activity).lower()
@@ -84,21 +138,10 @@ def create_description(row):
     if pd.notna(license_plate) and str(license_plate).strip() and str(license_plate).lower() != 'nan':
         parts.append(f"License plate: {str(license_plate).strip()}")
     
-    # Days parked - be careful with parsing
-    days_col = 'How Many Days Has the Vehicle Been Reported as Parked?'
-    days = row.get(days_col, '')
-    if pd.notna(days) and str(days).strip() and str(days).lower() not in ['nan', '']:
-        try:
-            # Extract number from string if needed
-            days_str = str(days).strip()
-            # Remove any non-numeric characters except decimal point
-            days_clean = re.sub(r'[^\d.]', '', days_str)
-            if days_clean:
-                days_int = int(float(days_clean))
-                if 0 < days_int < 1000:  # Sanity check
-                    parts.append(f"Parked for {days_int} days")
-        except:
-            pass
+    # Days parked
+    days_int = parse_days_parked(row.get(DAYS_PARKED_COLUMN, ''))
+    if 0 < days_int < 1000:  # Sanity check
+        parts.append(f"Parked for {days_int} days")
     
     # Action/Status
     action = row.get('Most Recent Action', '')
@@ -107,114 +150,108 @@ def create_description(row):
     
     return '. '.join(parts) if parts else "Abandoned vehicle complaint"
 
-def process_data():
-    """Process the raw text data into ML format"""
-    # Parse the text data
-    lines = raw_data_text.strip().split('\n')
-    
-    # Get headers
-    headers = [h.strip() for h in lines[0].split('\t')]
-    
-    # Parse data rows
-    rows = []
-    for line in lines[1:]:
-        if line.strip():
-            values = [v.strip() for v in line.split('\t')]
-            if len(values) >= 10:  # At least some data
-                row_dict = dict(zip(headers, values))
-                rows.append(row_dict)
-    
-    # Create DataFrame
-    df = pd.DataFrame(rows)
-    
-    # Print available columns for debugging
-    print(f"\nAvailable columns in raw data: {list(df.columns)[:15]}...")
-    
-    # Process into ML format
-    processed = []
-    for idx, row in df.iterrows():
-        # Get days parked with proper parsing
-        days_col = 'How Many Days Has the Vehicle Been Reported as Parked?'
-        days_raw = row.get(days_col, 0)
-        try:
-            if pd.isna(days_raw) or str(days_raw).strip() == '':
-                days = 0
-            else:
-                days_str = re.sub(r'[^\d.]', '', str(days_raw))
-                days = int(float(days_str)) if days_str else 0
-                if days > 1000:  # Likely parsing error
-                    days = 0
-        except:
-            days = 0
-        
-        action = row.get('Most Recent Action', '')
-        activity = row.get('Current Activity', '')
-        
-        # Build location
-        location_parts = []
-        if pd.notna(row.get('Street Address')) and str(row['Street Address']).strip():
-            location_parts.append(str(row['Street Address']))
-        if pd.notna(row.get('ZIP Code')) and str(row['ZIP Code']).strip():
-            location_parts.append(f"ZIP {row['ZIP Code']}")
-        location = ', '.join(location_parts) if location_parts else "Location not specified"
-        
-        # Helper function to safely get column value
-        def get_col(col_name, default=''):
-            val = row.get(col_name, default)
-            return val if pd.notna(val) else default
-        
-        # Build the record with all columns - using exact column names from raw data
-        record = {
-            'category': 'Others',  # Map to existing category
-            'description': create_description(row),
-            'location': location,
-            'priority': determine_priority(days, action, activity),
-            # Additional columns - using exact column names from the raw data
-            'creation_date': get_col('Creation Date'),
-            'status': get_col('Status'),
-            'completion_date': get_col('Completion Date'),
-            'service_request_number': get_col('Service Request Number'),
-            'type_of_service_request': get_col('Type of Service Request'),
-            'license_plate': get_col('License Plate'),
-            'vehicle_make_model': get_col('Vehicle Make/Model'),
-            'vehicle_color': get_col('Vehicle Color'),
-            'current_activity': get_col('Current Activity'),
-            'most_recent_action': get_col('Most Recent Action'),
-            'days_parked': days,
-            'street_address': get_col('Street Address'),
-            'zip_code': get_col('ZIP Code'),
-            'x_coordinate': get_col('X Coordinate'),
-            'y_coordinate': get_col('Y Coordinate'),
-            'ward': get_col('Ward'),
-            'police_district': get_col('Police District'),
-            'community_area': get_col('Community Area'),
-            'ssa': get_col('SSA'),
-            'latitude': get_col('Latitude'),
-            'longitude': get_col('Longitude'),
-            'location_full': get_col('Location'),
-            'historical_wards_2003_2015': get_col('Historical Wards 2003-2015'),
-            'zip_codes': get_col('Zip Codes'),
-            'community_areas': get_col('Community Areas'),
-            'census_tracts': get_col('Census Tracts'),
-            'wards': get_col('Wards')
-        }
+def iter_raw_rows(stream, delimiter='\t'):
+    """
+    Yield raw export rows as dicts of stripped strings, one line at a time
+    
+    Args:
+        stream: Text stream of the raw export, header line first
+        delimiter: '\t' for TSV exports, ',' for CSV
+    """
+    # TSV exports are plain tab-separated text; quotes in values are literal
+    quoting = csv.QUOTE_NONE if delimiter == '\t' else csv.QUOTE_MINIMAL
+    reader = csv.reader(stream, delimiter=delimiter, quoting=quoting)
+    
+    headers = [h.strip() for h in next(reader, [])]
+    for values in reader:
+        if len(values) >= 10:  # At least some data
+            yield dict(zip(headers, (v.strip() for v in values)))
+
+def convert_row(row):
+    """Convert one raw export row into an output record"""
+    days = parse_days_parked(row.get(DAYS_PARKED_COLUMN, 0))
+    
+    # Build location
+    location_parts = []
+    if row.get('Street Address'):
+        location_parts.append(row['Street Address'])
+    if row.get('ZIP Code'):
+        location_parts.append(f"ZIP {row['ZIP Code']}")
+    location = ', '.join(location_parts) if location_parts else "Location not specified"
+    
+    record = {
+        'category': 'Others',  # Map to existing category
+        'description': create_description(row),
+        'location': location,
+        'priority': determine_priority(days, row.get('Most Recent Action', ''), row.get('Current Activity', ''))
+    }
+    # Additional columns - using exact column names from the raw data
+    for column, raw_column in PASSTHROUGH_COLUMNS:
+        record[column] = row.get(raw_column, '') if raw_column else days
+    return record
+
+def detect_delimiter(input_file):
+    """Tab for .tsv/.txt exports, comma for .csv, otherwise guessed from the header line"""
+    file_ext = os.path.splitext(input_file)[1].lower()
+    if file_ext in ['.tsv', '.txt']:
+        return '\t'
+    if file_ext == '.csv':
+        return ','
+    with open(input_file, newline='', encoding='utf-8') as f:
+        return '\t' if '\t' in f.readline() else ','
+
+def process_data(input_file=None, output_file='vehicle_dataset.csv', delimiter=None):
+    """
+    Convert a raw vehicle complaint export into ML format
+    
+    Args:
+        input_file: Path to a raw TSV/CSV export; the sample data above is
+                    used if None
+        output_file: Path to output CSV file
+        delimiter: Field delimiter; detected from the file if None
         
-        processed.append(record)
+    Returns:
+        Number of records written
+    """
+    if input_file is None:
+        stream = io.StringIO(raw_data_text.strip())
+        delimiter = '\t'
+    else:
+        delimiter = delimiter or detect_delimiter(input_file)
+        stream = open(input_file, newline='', encoding='utf-8')
     
-    result_df = pd.DataFrame(processed)
-    result_df.to_csv('vehicle_dataset.csv', index=False)
+    total = 0
+    priority_counts = Counter()
+    with stream, open(output_file, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(OUTPUT_COLUMNS)
+        output_values = operator.itemgetter(*OUTPUT_COLUMNS)
+        
+        for row in iter_raw_rows(stream, delimiter):
+            if total == 0:
+                # Print available columns for debugging
+                print(f"\nAvailable columns in raw data: {list(row)[:15]}...")
+            record = convert_row(row)
+            writer.writerow(output_values(record))
+            priority_counts[record['priority']] += 1
+            total += 1
     
-    print(f"Processed {len(result_df)} records")
+    print(f"Processed {total} records")
     print(f"\nPriority distribution:")
-    print(result_df['priority'].value_counts())
-    print(f"\nSaved to: vehicle_dataset.csv")
+    for priority, count in priority_counts.most_common():
+        print(f"{priority}: {count}")
+    print(f"\nSaved to: {output_file}")
     print("\nNext steps:")
-    print("1. Review vehicle_dataset.csv")
-    print("2. Set DATASET_PATH='vehicle_dataset.csv' in app.py or as environment variable")
+    print(f"1. Review {output_file}")
+    print(f"2. Set DATASET_PATH='{output_file}' in app.py or as environment variable")
     print("3. Run: python app.py")
     
-    return result_df
+    return total
 
 if __name__ == '__main__':
-    process_data()
-
+    input_file = sys.argv[1] if len(sys.argv) > 1 else None
+    output_file = sys.argv[2] if len(sys.argv) > 2 else 'vehicle_dataset.csv'
+    if input_file and not os.path.exists(input_file):
+        print(f"Input file not found: {input_file}")
+        sys.exit(1)
+    process_data(input_file, output_file)
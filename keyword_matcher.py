@@ -0,0 +1,96 @@
+"""
+Precompiled multi-keyword matching shared by the ML explanations and the
+KRR rule engine.
+"""
+import re
+
+def _trie_pattern(keywords):
+    """
+    Regex alternation of keywords factored into a trie by common prefix
+
+    'danger|dangerous|dark' becomes 'da(?:nger(?:ous)?|rk)', so the regex
+    engine follows one path per position instead of trying every keyword.
+    Optional suffixes are greedy, so the longest keyword is tried first.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + pattern + ')?' if '' in node else pattern
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Match groups of keywords against a text in a single regex scan"""
+
+    def __init__(self, keyword_groups, word_boundaries=False):
+        """
+        Args:
+            keyword_groups: Dict mapping a group id to an iterable of keywords
+            word_boundaries: Only match whole words ('danger' does not match
+                             'dangerous'); otherwise keywords match anywhere
+        """
+        self._group_keywords = {}
+        groups_by_keyword = {}
+        for group, keywords in keyword_groups.items():
+            ordered = self._group_keywords.setdefault(group, [])
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword not in ordered:
+                    ordered.append(keyword)
+                groups_by_keyword.setdefault(keyword, set()).add(group)
+
+        if word_boundaries:
+            def contains(keyword, other):
+                return re.search(r'\b' + re.escape(other) + r'\b', keyword) is not None
+        else:
+            def contains(keyword, other):
+                return other in keyword
+
+        # Each position reports its longest match; a keyword found in the
+        # text implies every keyword it contains
+        keywords = list(groups_by_keyword)
+        self._implied_keywords = {
+            keyword: frozenset(other for other in keywords if contains(keyword, other))
+            for keyword in keywords
+        }
+        self._implied_groups = {
+            keyword: frozenset(group for other in implied for group in groups_by_keyword[other])
+            for keyword, implied in self._implied_keywords.items()
+        }
+        # Zero-width lookahead so matches are found at every position, overlapping or not
+        boundary = r'\b' if word_boundaries else ''
+        self._pattern = re.compile(f'{boundary}(?=({_trie_pattern(keywords)}){boundary})') if keywords else None
+
+    def match(self, text):
+        """Return the ids of all groups with at least one keyword in the (lowercased) text"""
+        matched = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                matched |= self._implied_groups[match.group(1)]
+        return matched
+
+    def find(self, text):
+        """
+        Find the keywords of every group in the (lowercased) text
+
+        Returns:
+            Dict mapping each group id to its matched keywords, in the order
+            the group listed them
+        """
+        found = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                found |= self._implied_keywords[match.group(1)]
+        return {
+            group: [keyword for keyword in keywords if keyword in found]
+            for group, keywords in self._group_keywords.items()
+        }
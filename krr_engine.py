@@ -1,55 +1,130 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from bisect import bisect_left, insort
+import heapq
 import re
+import threading
+from keyword_matcher import KeywordMatcher
+from metrics import timed
+
+PRIORITY_ORDER = {'High': 0, 'Medium': 1, 'Low': 2}
+
+def normalize_location(location):
+    """Normalize a location so spelling variants of the same place share a key"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', str(location or '').lower()).split())
+
+class LocationFrequencyCounter:
+    """
+    Sliding-window count of reports per (location, category)
+    
+    Each key keeps the sorted timestamps of its reports inside the window;
+    expired timestamps are dropped lazily, so recording and counting are
+    amortized constant time. A heap of all timestamps lets every record()
+    also sweep expired reports of keys that are never seen again, so memory
+    is bounded by the reports inside the window.
+    """
+    
+    def __init__(self, window_days=7):
+        self.window = timedelta(days=window_days)
+        self._timestamps = {}
+        self._expiry = []
+        self._lock = threading.Lock()
+    
+    def _expire(self, key, now):
+        timestamps = self._timestamps.get(key)
+        if not timestamps:
+            return
+        cutoff = bisect_left(timestamps, now - self.window)
+        if cutoff:
+            del timestamps[:cutoff]
+        if not timestamps:
+            del self._timestamps[key]
+    
+    def _sweep(self, now):
+        """Expire old reports across all keys, oldest first"""
+        cutoff = now - self.window
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, key = heapq.heappop(self._expiry)
+            self._expire(key, now)
+    
+    def record(self, location, category, timestamp=None):
+        """Record a report; reports older than the window are ignored"""
+        now = datetime.utcnow()
+        timestamp = timestamp or now
+        if timestamp < now - self.window:
+            return
+        key = (normalize_location(location), category)
+        with self._lock:
+            insort(self._timestamps.setdefault(key, []), timestamp)
+            heapq.heappush(self._expiry, (timestamp, key))
+            self._sweep(now)
+    
+    def count(self, location, category):
+        """Number of reports for this location and category within the window"""
+        key = (normalize_location(location), category)
+        with self._lock:
+            self._expire(key, datetime.utcnow())
+            return len(self._timestamps.get(key, ()))
+    
+    def rebuild(self, reports):
+        """
+        Replace the counter contents
+        
+        Args:
+            reports: Iterable of (location, category, timestamp) tuples
+        """
+        with self._lock:
+            self._timestamps = {}
+            self._expiry = []
+        for location, category, timestamp in reports:
+            self.record(location, category, timestamp)
 
 class KRREngine:
     """Knowledge Representation and Reasoning Engine for advisory recommendations"""
     
-    def __init__(self):
+    def __init__(self, location_counter=None):
+        self.location_counter = location_counter or LocationFrequencyCounter()
         self.rules = self._initialize_rules()
+        self._compile_rules()
     
     def _initialize_rules(self):
         """Initialize rule base"""
         return [
             {
                 'name': 'Streetlight Dangerous',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Streetlight issue',
-                    lambda cat, desc, loc: any(word in desc.lower() for word in ['dangerous', 'dark', 'no light', 'no lights', 'broken', 'safety'])
-                ],
+                'category': 'Streetlight issue',
+                'keywords': ['dangerous', 'dark', 'no light', 'no lights', 'broken', 'safety'],
+                'conditions': [],
                 'action': 'Dispatch repair team within 24 hours. High safety priority.',
                 'priority': 'High'
             },
             {
                 'name': 'Waste Overflowing',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Waste collection',
-                    lambda cat, desc, loc: any(word in desc.lower() for word in ['overflowing', 'overflow', 'blocking', 'blocked', 'health'])
-                ],
+                'category': 'Waste collection',
+                'keywords': ['overflowing', 'overflow', 'blocking', 'blocked', 'health'],
+                'conditions': [],
                 'action': 'Send garbage collection team immediately. Health hazard detected.',
                 'priority': 'High'
             },
             {
                 'name': 'Road Accident Risk',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Road repair',
-                    lambda cat, desc, loc: any(word in desc.lower() for word in ['accident', 'dangerous', 'urgent', 'immediate', 'pothole', 'damage'])
-                ],
+                'category': 'Road repair',
+                'keywords': ['accident', 'dangerous', 'urgent', 'immediate', 'pothole', 'damage'],
+                'conditions': [],
                 'action': 'Prioritize road repair team. Safety risk identified.',
                 'priority': 'High'
             },
             {
                 'name': 'Water Emergency',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Water service issue',
-                    lambda cat, desc, loc: any(word in desc.lower() for word in ['burst', 'flood', 'flooding', 'leak', 'emergency', 'urgent'])
-                ],
+                'category': 'Water service issue',
+                'keywords': ['burst', 'flood', 'flooding', 'leak', 'emergency', 'urgent'],
+                'conditions': [],
                 'action': 'Dispatch water service team immediately. Emergency situation.',
                 'priority': 'High'
             },
             {
                 'name': 'Streetlight Night Time',
+                'category': 'Streetlight issue',
                 'conditions': [
-                    lambda cat, desc, loc: cat == 'Streetlight issue',
                     lambda cat, desc, loc: self._is_night_time()
                 ],
                 'action': 'Immediate dispatch recommended due to night time conditions.',
@@ -57,17 +132,17 @@ class KRREngine:
             },
             {
                 'name': 'Waste High Frequency',
+                'category': 'Waste collection',
                 'conditions': [
-                    lambda cat, desc, loc: cat == 'Waste collection',
-                    lambda cat, desc, loc: self._check_location_frequency(loc) > 2
+                    lambda cat, desc, loc: self._check_location_frequency(loc, cat) > 2
                 ],
                 'action': 'Multiple reports from this area. Prioritize clean-up team.',
                 'priority': 'Medium'
             },
             {
                 'name': 'Noise Night Time',
+                'category': 'Noise complaint',
                 'conditions': [
-                    lambda cat, desc, loc: cat == 'Noise complaint',
                     lambda cat, desc, loc: self._is_night_time()
                 ],
                 'action': 'Noise complaint during night hours. Send inspection team.',
@@ -75,41 +150,36 @@ class KRREngine:
             },
             {
                 'name': 'Standard Streetlight',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Streetlight issue'
-                ],
+                'category': 'Streetlight issue',
+                'conditions': [],
                 'action': 'Schedule maintenance team for streetlight repair.',
                 'priority': 'Medium'
             },
             {
                 'name': 'Standard Waste',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Waste collection'
-                ],
+                'category': 'Waste collection',
+                'conditions': [],
                 'action': 'Schedule regular garbage collection.',
                 'priority': 'Medium'
             },
             {
                 'name': 'Standard Road',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Road repair'
-                ],
+                'category': 'Road repair',
+                'conditions': [],
                 'action': 'Add to road maintenance schedule.',
                 'priority': 'Medium'
             },
             {
                 'name': 'Graffiti Standard',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Graffiti removal'
-                ],
+                'category': 'Graffiti removal',
+                'conditions': [],
                 'action': 'Schedule graffiti removal team.',
                 'priority': 'Low'
             },
             {
                 'name': 'General Inquiry',
-                'conditions': [
-                    lambda cat, desc, loc: cat == 'Others'
-                ],
+                'category': 'Others',
+                'conditions': [],
                 'action': 'Forward to appropriate department for review.',
                 'priority': 'Low'
             }
@@ -120,35 +190,69 @@ class KRREngine:
         current_hour = datetime.now().hour
         return current_hour >= 18 or current_hour < 6
     
-    def _check_location_frequency(self, location):
-        """Check frequency of reports from same location (simplified)"""
-        # In a real system, this would query the database
-        # For now, return a mock value
-        return 0
+    def _check_location_frequency(self, location, category):
+        """Check frequency of recent reports from same location and category"""
+        return self.location_counter.count(location, category)
     
-    def get_advisory(self, category, description, location):
-        """Get advisory recommendation based on rules"""
-        # Try to match rules in priority order (High priority rules first)
-        sorted_rules = sorted(self.rules, key=lambda r: ['High', 'Medium', 'Low'].index(r['priority']))
+    def _compile_rules(self):
+        """
+        Build the rule index used by get_advisory
+        
+        Rules are ordered by priority once and grouped by category, and each
+        category's keyword sets are compiled into a single matcher. Rules
+        without a category apply to every category.
+        """
+        sorted_rules = sorted(self.rules, key=lambda r: PRIORITY_ORDER[r['priority']])
+        generic_rules = [rule for rule in sorted_rules if rule.get('category') is None]
         
-        for rule in sorted_rules:
-            if all(condition(category, description, location) for condition in rule['conditions']):
-                return rule['action']
+        def build_entry(rules):
+            keyword_groups = {id(rule): rule['keywords'] for rule in rules if rule.get('keywords')}
+            return rules, KeywordMatcher(keyword_groups)
         
-        # Default advisory if no rule matches
-        return f"Standard processing for {category} request. Review and assign to appropriate team."
+        self._rule_index = {}
+        for category in {rule['category'] for rule in sorted_rules if rule.get('category') is not None}:
+            rules = [rule for rule in sorted_rules if rule.get('category') in (category, None)]
+            self._rule_index[category] = build_entry(rules)
+        self._generic_entry = build_entry(generic_rules)
     
-    def add_rule(self, name, conditions, action, priority='Medium'):
-        """Add a new rule to the rule base"""
+    def get_advisory(self, category, description, location):
+        """Get advisory recommendation based on rules"""
+        with timed('krr_advisory'):
+            rules, matcher = self._rule_index.get(category, self._generic_entry)
+            matched_keywords = matcher.match(description.lower())
+            
+            # Rules are already in priority order (High priority rules first)
+            for rule in rules:
+                if rule.get('keywords') and id(rule) not in matched_keywords:
+                    continue
+                if all(condition(category, description, location) for condition in rule['conditions']):
+                    return rule['action']
+            
+            # Default advisory if no rule matches
+            return f"Standard processing for {category} request. Review and assign to appropriate team."
+    
+    def add_rule(self, name, conditions, action, priority='Medium', category=None, keywords=None):
+        """
+        Add a new rule to the rule base
+        
+        Args:
+            name: Rule name
+            conditions: List of callables (category, description, location) -> bool
+            action: Advisory text returned when the rule matches
+            priority: 'High', 'Medium' or 'Low'
+            category: Only apply the rule to this category (None for all categories)
+            keywords: The rule matches only if the description contains one of these
+        """
         self.rules.append({
             'name': name,
+            'category': category,
+            'keywords': keywords,
             'conditions': conditions,
             'action': action,
             'priority': priority
         })
+        self._compile_rules()
     
     def get_all_rules(self):
         """Get all rules (for admin/debugging)"""
         return self.rules
-
-
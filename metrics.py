@@ -0,0 +1,176 @@
+"""
+In-process counters and latency histograms, exported in the Prometheus
+text format by the /metrics route.
+
+Code on the triage path wraps each stage in `timed(stage)`. Durations go
+into the triage_stage_seconds histogram and, while a request trace is
+active on the current thread, into that request's stage breakdown for the
+slow-request log. Metrics are per process.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+
+# Upper bounds in seconds; stages range from sub-millisecond lookups to
+# model loads that take seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values)) + (extra or [])
+    if not pairs:
+        return ''
+    escaped = [
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    ]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, list(counts), total) for key, (counts, total) in self._series.items())
+        bounds = [repr(bound) for bound in self.buckets] + ['+Inf']
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, [('le', bound)])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+class Gauge:
+    """Value read from a callback when the metrics are rendered"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def samples(self):
+        yield f"{self.name} {_format_value(self.read())}"
+
+class CallbackCounter(Gauge):
+    """Monotonic total read from a callback, for counts kept by another object"""
+
+    type_name = 'counter'
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, label_names=()):
+        return self.register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, label_names, buckets))
+
+    def gauge(self, name, help_text, read):
+        return self.register(Gauge(name, help_text, read))
+
+    def callback_counter(self, name, help_text, read):
+        return self.register(CallbackCounter(name, help_text, read))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+stage_seconds = registry.histogram(
+    'triage_stage_seconds', 'Time spent in each stage of the triage path', ['stage']
+)
+
+_trace = threading.local()
+
+@contextmanager
+def timed(stage):
+    """Time a block as one stage of the triage path"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        stages = getattr(_trace, 'stages', None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+
+def start_trace():
+    """Start collecting a stage breakdown for the current thread"""
+    _trace.stages = {}
+
+def end_trace():
+    """
+    Stop collecting the stage breakdown of the current thread
+
+    Returns:
+        Dict mapping stage names to seconds spent in them
+    """
+    stages = getattr(_trace, 'stages', None)
+    _trace.stages = None
+    return stages or {}
@@ -1,16 +1,178 @@
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-import joblib
+# pandas, numpy, scikit-learn, scipy and joblib are imported inside the
+# methods that need them, so importing this module (and the web app) stays
+# fast and the cost is only paid when a model is trained or loaded
+import copy
+import logging
 import os
 import re
+import threading
+import time
 from datetime import datetime
+from keyword_matcher import KeywordMatcher
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the layout of the model bundle changes
+MODEL_BUNDLE_FORMAT = 1
+
+# 'forest' fits a RandomForest on the whole dataset in memory; 'streaming'
+# reads the dataset in chunks and trains incrementally with bounded memory
+TRAINING_MODES = ['forest', 'streaming']
+
+# Training parameters; override through MLPriorityPredictor(training_params=...)
+# or per call to train_model / retrain_with_dataset
+DEFAULT_TRAINING_PARAMS = {
+    'mode': 'forest',
+    'n_estimators': 100,      # Trees in the forest
+    'max_depth': 10,          # Maximum tree depth (None for unlimited)
+    'max_features': 100,      # TF-IDF vocabulary size
+    'n_jobs': -1,             # Cores used for training (-1 for all)
+    'chunk_size': 10000,      # Rows read per chunk in streaming mode
+    'hash_features': 2 ** 18  # Hashed text features in streaming mode
+}
+
+# Datasets that can be read in chunks without loading the whole file
+CHUNKED_DATASET_FORMATS = ['.csv', '.jsonl', '.ndjson', '.parquet']
+
+# Columnar formats (need pyarrow); only the columns that are kept are read
+COLUMNAR_DATASET_FORMATS = ['.parquet', '.feather', '.arrow']
+
+# Batches at least this large are predicted with all cores; smaller ones
+# run single-threaded to avoid spinning up a thread pool per request
+PARALLEL_PREDICT_MIN_ROWS = 1000
+
+def resolve_training_params(*overrides):
+    """
+    Merge training parameter overrides onto the defaults
+    
+    Raises:
+        ValueError: On unknown parameters or invalid values
+    """
+    params = dict(DEFAULT_TRAINING_PARAMS)
+    for override in overrides:
+        for key, value in (override or {}).items():
+            if key not in DEFAULT_TRAINING_PARAMS:
+                raise ValueError(f"Unknown training parameter: {key}")
+            if key == 'mode':
+                if value not in TRAINING_MODES:
+                    raise ValueError(f"Training mode must be one of {TRAINING_MODES}")
+                params[key] = value
+                continue
+            if value is None and key == 'max_depth':
+                params[key] = None
+                continue
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Training parameter {key} must be an integer")
+            if value < 1 and not (key == 'n_jobs' and value == -1):
+                raise ValueError(f"Training parameter {key} must be positive")
+            params[key] = value
+    return params
+
+
+# Environment variables that override DEFAULT_TRAINING_PARAMS
+TRAINING_PARAM_ENV_VARS = {
+    'mode': 'TRAIN_MODE',
+    'n_estimators': 'TRAIN_N_ESTIMATORS',
+    'max_depth': 'TRAIN_MAX_DEPTH',
+    'max_features': 'TRAIN_MAX_FEATURES',
+    'n_jobs': 'TRAIN_N_JOBS',
+    'chunk_size': 'TRAIN_CHUNK_SIZE',
+    'hash_features': 'TRAIN_HASH_FEATURES'
+}
+
+def training_params_from_env(environ=None):
+    """
+    Training parameter overrides from the TRAIN_* environment variables
+    
+    A malformed value is logged and left out, so its default is used
+    instead of the app failing to start.
+    
+    Returns:
+        Dict of valid overrides, for resolve_training_params
+    """
+    environ = os.environ if environ is None else environ
+    params = {}
+    for param, env_var in TRAINING_PARAM_ENV_VARS.items():
+        value = environ.get(env_var)
+        if not value:
+            continue
+        try:
+            resolve_training_params({param: value})
+        except ValueError as e:
+            logger.warning("Ignoring %s=%r (%s); using the default %r", env_var, value, e,
+                           DEFAULT_TRAINING_PARAMS[param])
+            continue
+        params[param] = value
+    return params
+
+
+def detect_column_map(columns):
+    """
+    Auto-detect dataset columns (case-insensitive)
+    
+    Args:
+        columns: Column names of the dataset
+        
+    Returns:
+        Dict mapping expected column names to the dataset's column names
+    """
+    column_map = {}
+    
+    # Try to find category column
+    for col in columns:
+        if 'category' in col.lower() or 'type' in col.lower():
+            column_map['category'] = col
+            break
+    
+    # Try to find description column
+    for col in columns:
+        if 'description' in col.lower() or 'desc' in col.lower() or 'details' in col.lower():
+            column_map['description'] = col
+            break
+    
+    # Try to find location column
+    for col in columns:
+        if 'location' in col.lower() or 'address' in col.lower() or 'barangay' in col.lower():
+            column_map['location'] = col
+            break
+    
+    # Try to find priority column
+    for col in columns:
+        if 'priority' in col.lower() or 'label' in col.lower() or 'class' in col.lower():
+            column_map['priority'] = col
+            break
+    
+    return column_map
+
+
+def count_features(tfidf_vectorizer, category_encoder):
+    """Number of model input features produced by a vectorizer and encoder"""
+    if category_encoder is None:
+        return tfidf_vectorizer.n_features
+    return len(tfidf_vectorizer.vocabulary_) + 1
+
+
+class ModelState:
+    """
+    A trained model together with the vectorizer and encoder it was trained with
+    
+    Streaming models use a stateless HashingVectorizer in place of the TF-IDF
+    vectorizer and have no category encoder; the category is hashed along
+    with the description instead.
+    """
+    
+    def __init__(self, model, tfidf_vectorizer, category_encoder, model_version=None):
+        self.model = model
+        self.tfidf_vectorizer = tfidf_vectorizer
+        self.category_encoder = category_encoder
+        self.model_version = model_version
+
 
 class MLPriorityPredictor:
-    def __init__(self, dataset_path=None, column_mapping=None):
+    def __init__(self, dataset_path=None, column_mapping=None, training_params=None, prediction_cache=None):
         """
         Initialize ML Priority Predictor
         
@@ -19,15 +181,26 @@ class MLPriorityPredictor:
             column_mapping: Dict mapping dataset columns to expected columns
                           {'category': 'Category', 'description': 'Description', 
                            'location': 'Location', 'priority': 'Priority'}
+            training_params: Overrides of DEFAULT_TRAINING_PARAMS
+            prediction_cache: Optional PredictionCache for repeated requests
         """
-        self.model = None
-        self.tfidf_vectorizer = None
-        self.category_encoder = None
+        # Current ModelState. Replaced as a whole (a single reference
+        # assignment) so a prediction never mixes pieces of two models
+        self._state = None
+        self.bundle_path = 'models/priority_model_bundle.joblib'
+        # Separate files written by older versions; migrated into a bundle on load
         self.model_path = 'models/priority_model.joblib'
         self.vectorizer_path = 'models/tfidf_vectorizer.joblib'
         self.encoder_path = 'models/category_encoder.joblib'
         self.dataset_path = dataset_path
         self.column_mapping = column_mapping or {}
+        self.training_params = resolve_training_params(training_params)
+        self.last_training = None
+        self.prediction_cache = prediction_cache
+        self.load_seconds = None
+        self._init_lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._ready = threading.Event()
         
         # Create models directory
         os.makedirs('models', exist_ok=True)
@@ -42,10 +215,51 @@ class MLPriorityPredictor:
                       'malfunction', 'concern', 'complaint', 'disturbance'],
             'Low': ['request', 'inquiry', 'question', 'information', 'general']
         }
+        # Call compile_keywords() after changing priority_keywords
+        self.compile_keywords()
+    
+    def compile_keywords(self):
+        """Compile priority_keywords into one whole-word matcher"""
+        self._keyword_matcher = KeywordMatcher(self.priority_keywords, word_boundaries=True)
+    
+    def match_priority_keywords(self, description):
+        """
+        Find the keywords of every priority in a description in one scan
+        
+        Returns:
+            Dict mapping 'High', 'Medium' and 'Low' to their matched keywords
+        """
+        return self._keyword_matcher.find(str(description or '').lower())
+    
+    @property
+    def model(self):
+        return self._state.model if self._state else None
+    
+    @property
+    def tfidf_vectorizer(self):
+        return self._state.tfidf_vectorizer if self._state else None
+    
+    @property
+    def category_encoder(self):
+        return self._state.category_encoder if self._state else None
+    
+    @property
+    def model_version(self):
+        return self._state.model_version if self._state else None
+    
+    def _set_state(self, state):
+        """Swap in a new model state"""
+        self._state = state
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear(state.model_version)
+        self._ready.set()
     
     def load_dataset(self, file_path=None):
         """
-        Load dataset from file (CSV, Excel, or JSON)
+        Load dataset from file (CSV, Excel, JSON, Parquet or Feather/Arrow)
+        
+        Only the columns that end up in the returned DataFrame are parsed
+        from CSV, Excel and columnar files.
         
         Args:
             file_path: Path to dataset file. If None, uses self.dataset_path
@@ -60,95 +274,34 @@ class MLPriorityPredictor:
             print(f"Dataset file not found: {file_path}. Using sample data.")
             return None
         
+        import pandas as pd
+        
         try:
             # Determine file type and load
             file_ext = os.path.splitext(file_path)[1].lower()
+            columns = self._dataset_columns(file_path, file_ext)
             
             if file_ext == '.csv':
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(file_path, usecols=columns)
             elif file_ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
+                df = pd.read_excel(file_path, usecols=columns)
+            elif file_ext == '.parquet':
+                df = pd.read_parquet(file_path, columns=columns)
+            elif file_ext in ['.feather', '.arrow']:
+                df = pd.read_feather(file_path, columns=columns)
             elif file_ext == '.json':
                 df = pd.read_json(file_path)
+            elif file_ext in ['.jsonl', '.ndjson']:
+                df = pd.read_json(file_path, lines=True)
             else:
                 print(f"Unsupported file format: {file_ext}. Using sample data.")
                 return None
             
-            # Apply column mapping if provided
-            if self.column_mapping:
-                df = df.rename(columns=self.column_mapping)
-            
-            # Auto-detect column names (case-insensitive)
-            df.columns = df.columns.str.strip()
-            column_map = {}
-            
-            # Try to find category column
-            for col in df.columns:
-                if 'category' in col.lower() or 'type' in col.lower():
-                    column_map['category'] = col
-                    break
-            
-            # Try to find description column
-            for col in df.columns:
-                if 'description' in col.lower() or 'desc' in col.lower() or 'details' in col.lower():
-                    column_map['description'] = col
-                    break
-            
-            # Try to find location column
-            for col in df.columns:
-                if 'location' in col.lower() or 'address' in col.lower() or 'barangay' in col.lower():
-                    column_map['location'] = col
-                    break
-            
-            # Try to find priority column
-            for col in df.columns:
-                if 'priority' in col.lower() or 'label' in col.lower() or 'class' in col.lower():
-                    column_map['priority'] = col
-                    break
-            
-            # Rename columns if mapping found
-            if column_map:
-                df = df.rename(columns={v: k for k, v in column_map.items()})
-            
-            # Validate required columns
-            required_cols = ['category', 'description', 'priority']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            
-            if missing_cols:
-                print(f"Missing required columns: {missing_cols}")
-                print(f"Available columns: {list(df.columns)}")
+            df = self._clean_dataset(df)
+            if df is None:
                 print("Using sample data instead.")
                 return None
             
-            # Clean data
-            df = df.dropna(subset=required_cols)
-            
-            # Normalize priority values
-            if 'priority' in df.columns:
-                df['priority'] = df['priority'].astype(str).str.strip()
-                df['priority'] = df['priority'].str.title()
-                # Map common variations
-                priority_map = {
-                    'High': 'High', 'H': 'High', '1': 'High', 'Urgent': 'High',
-                    'Medium': 'Medium', 'M': 'Medium', '2': 'Medium', 'Normal': 'Medium',
-                    'Low': 'Low', 'L': 'Low', '3': 'Low', 'Minor': 'Low'
-                }
-                df['priority'] = df['priority'].map(priority_map).fillna(df['priority'])
-                
-                # Filter out invalid priority values (only keep High, Medium, Low)
-                valid_priorities = ['High', 'Medium', 'Low']
-                invalid_count = len(df[~df['priority'].isin(valid_priorities)])
-                if invalid_count > 0:
-                    print(f"Warning: {invalid_count} records with invalid priority values will be removed.")
-                df = df[df['priority'].isin(valid_priorities)]
-            
-            # Add location if missing (use empty string)
-            if 'location' not in df.columns:
-                df['location'] = ''
-            
-            # Select only required columns
-            df = df[required_cols + ['location']]
-            
             # Final validation - ensure we have data
             if len(df) == 0:
                 print("Error: No valid records found in dataset after cleaning.")
@@ -164,8 +317,161 @@ class MLPriorityPredictor:
             print("Using sample data instead.")
             return None
     
+    def iter_dataset_chunks(self, file_path=None, chunk_size=10000):
+        """
+        Read and clean a dataset in chunks
+        
+        CSV, JSON Lines and Parquet files are streamed; other formats cannot
+        be read incrementally and are loaded once and sliced.
+        
+        Args:
+            file_path: Path to dataset file. If None, uses self.dataset_path
+            chunk_size: Number of rows read per chunk
+            
+        Yields:
+            DataFrames with columns: category, description, location, priority
+            
+        Raises:
+            ValueError: If the file is missing, unsupported or lacks required columns
+        """
+        if file_path is None:
+            file_path = self.dataset_path
+        
+        if file_path is None or not os.path.exists(file_path):
+            raise ValueError(f"Dataset file not found: {file_path}")
+        
+        file_ext = os.path.splitext(file_path)[1].lower()
+        if file_ext not in CHUNKED_DATASET_FORMATS:
+            df = self.load_dataset(file_path)
+            if df is None:
+                raise ValueError(f"Could not load dataset: {file_path}")
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+            return
+        
+        for chunk in self._read_dataset_chunks(file_path, file_ext, chunk_size):
+            chunk = self._clean_dataset(chunk)
+            if chunk is None:
+                raise ValueError(f"Dataset is missing required columns: {file_path}")
+            if len(chunk):
+                yield chunk
+    
+    def _read_dataset_chunks(self, file_path, file_ext, chunk_size):
+        """Yield raw DataFrame chunks of a CSV, JSON Lines or Parquet file"""
+        import pandas as pd
+        
+        columns = self._dataset_columns(file_path, file_ext)
+        
+        if file_ext == '.parquet':
+            import pyarrow.parquet as pq
+            
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+            return
+        
+        if file_ext == '.csv':
+            reader = pd.read_csv(file_path, usecols=columns, chunksize=chunk_size)
+        else:
+            reader = pd.read_json(file_path, lines=True, chunksize=chunk_size)
+        
+        with reader:
+            yield from reader
+    
+    def _dataset_columns(self, file_path, file_ext):
+        """
+        Raw columns of a dataset that _clean_dataset keeps
+        
+        Reads only the header (or schema) of the file, so the remaining
+        columns can be skipped when the data is parsed.
+        
+        Returns:
+            List of column names, or None to read every column
+        """
+        import pandas as pd
+        
+        if file_ext == '.csv':
+            names = pd.read_csv(file_path, nrows=0).columns
+        elif file_ext in ['.xlsx', '.xls']:
+            names = pd.read_excel(file_path, nrows=0).columns
+        elif file_ext == '.parquet':
+            import pyarrow.parquet as pq
+            names = pq.read_schema(file_path).names
+        elif file_ext in ['.feather', '.arrow']:
+            import pyarrow as pa
+            with pa.memory_map(file_path) as source:
+                names = pa.ipc.open_file(source).schema.names
+        else:
+            return None
+        
+        # Mirror the renaming in _clean_dataset
+        renamed = {name: str(self.column_mapping.get(name, name)).strip() for name in names}
+        kept = set(detect_column_map(list(renamed.values())).values())
+        kept.update(['category', 'description', 'location', 'priority'])
+        return [name for name, column in renamed.items() if column in kept]
+    
+    def _clean_dataset(self, df):
+        """
+        Map, validate and normalize the columns of a raw dataset
+        
+        Returns:
+            Cleaned DataFrame, or None if required columns are missing
+        """
+        # Apply column mapping if provided
+        if self.column_mapping:
+            df = df.rename(columns=self.column_mapping)
+        
+        # Auto-detect column names (case-insensitive)
+        df.columns = df.columns.str.strip()
+        column_map = detect_column_map(df.columns)
+        
+        # Rename columns if mapping found
+        if column_map:
+            df = df.rename(columns={v: k for k, v in column_map.items()})
+        
+        # Validate required columns
+        required_cols = ['category', 'description', 'priority']
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        
+        if missing_cols:
+            print(f"Missing required columns: {missing_cols}")
+            print(f"Available columns: {list(df.columns)}")
+            return None
+        
+        # Clean data
+        df = df.dropna(subset=required_cols)
+        
+        # Normalize priority values
+        if 'priority' in df.columns:
+            df['priority'] = df['priority'].astype(str).str.strip()
+            df['priority'] = df['priority'].str.title()
+            # Map common variations
+            priority_map = {
+                'High': 'High', 'H': 'High', '1': 'High', 'Urgent': 'High',
+                'Medium': 'Medium', 'M': 'Medium', '2': 'Medium', 'Normal': 'Medium',
+                'Low': 'Low', 'L': 'Low', '3': 'Low', 'Minor': 'Low'
+            }
+            df['priority'] = df['priority'].map(priority_map).fillna(df['priority'])
+            
+            # Filter out invalid priority values (only keep High, Medium, Low)
+            valid_priorities = ['High', 'Medium', 'Low']
+            invalid_count = len(df[~df['priority'].isin(valid_priorities)])
+            if invalid_count > 0:
+                print(f"Warning: {invalid_count} records with invalid priority values will be removed.")
+            df = df[df['priority'].isin(valid_priorities)]
+        
+        # Add location if missing (use empty string)
+        if 'location' not in df.columns:
+            df['location'] = ''
+        
+        # Select only required columns
+        df = df[required_cols + ['location']]
+        
+        return df
+    
     def generate_sample_data(self):
         """Generate sample training data based on common service request patterns"""
+        import pandas as pd
+        
         sample_data = []
         
         # High priority examples
@@ -222,62 +528,74 @@ class MLPriorityPredictor:
             })
         
         # Add more variations
-        for _ in range(50):
-            sample_data.append({
-                'category': np.random.choice(['Waste collection', 'Streetlight issue', 'Road repair', 
-                                            'Noise complaint', 'Water service issue', 'Graffiti removal', 'Others']),
-                'description': self._generate_random_description(),
-                'location': f"Street {np.random.randint(1, 100)}",
-                'priority': np.random.choice(['High', 'Medium', 'Low'], p=[0.3, 0.4, 0.3])
-            })
+        from synthetic_data import generate_requests
+        variations = generate_requests(50)[['category', 'description', 'location', 'priority']]
         
-        return pd.DataFrame(sample_data)
-    
-    def _generate_random_description(self):
-        """Generate random description for training data"""
-        templates = [
-            "Issue with {item}",
-            "{item} needs attention",
-            "Problem with {item}",
-            "{item} is broken",
-            "Request for {item} service"
-        ]
-        items = ['streetlight', 'garbage', 'road', 'water', 'noise', 'graffiti']
-        return np.random.choice(templates).format(item=np.random.choice(items))
+        return pd.concat([pd.DataFrame(sample_data), variations], ignore_index=True)
     
-    def prepare_features(self, df):
-        """Prepare features for ML model"""
+    def prepare_features(self, df, tfidf_vectorizer=None, category_encoder=None, max_features=100):
+        """
+        Prepare features for ML model
+        
+        Args:
+            df: DataFrame with category and description columns
+            tfidf_vectorizer: Fitted vectorizer to reuse; a new one is fitted if None
+            category_encoder: Fitted encoder to reuse; a new one is fitted if None
+            max_features: Vocabulary size of a newly fitted vectorizer
+            
+        Returns:
+            Tuple of (features, tfidf_vectorizer, category_encoder)
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import LabelEncoder
+        
         # Combine category and description for text features
         df['text'] = df['category'] + ' ' + df['description']
         
         # TF-IDF vectorization
-        if self.tfidf_vectorizer is None:
-            self.tfidf_vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-            text_features = self.tfidf_vectorizer.fit_transform(df['text'])
+        if tfidf_vectorizer is None:
+            tfidf_vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
+            text_features = tfidf_vectorizer.fit_transform(df['text'])
         else:
-            text_features = self.tfidf_vectorizer.transform(df['text'])
+            text_features = tfidf_vectorizer.transform(df['text'])
         
         # Category encoding
-        if self.category_encoder is None:
-            self.category_encoder = LabelEncoder()
-            category_encoded = self.category_encoder.fit_transform(df['category'])
+        if category_encoder is None:
+            category_encoder = LabelEncoder()
+            category_encoded = category_encoder.fit_transform(df['category'])
         else:
-            category_encoded = self.category_encoder.transform(df['category'])
+            category_encoded = category_encoder.transform(df['category'])
         
         # Combine features
         from scipy.sparse import hstack
         features = hstack([text_features, category_encoded.reshape(-1, 1)])
         
-        return features
+        return features, tfidf_vectorizer, category_encoder
     
-    def train_model(self, df=None, dataset_path=None):
+    def train_model(self, df=None, dataset_path=None, training_params=None):
         """
         Train the ML model
         
+        A complete new model state is built off to the side and swapped in
+        at the end, so concurrent predictions keep using the previous model
+        until training has finished.
+        
         Args:
             df: DataFrame with training data. If None, tries to load from dataset_path or self.dataset_path
             dataset_path: Path to dataset file (overrides self.dataset_path)
+            training_params: Overrides of self.training_params for this run
         """
+        params = resolve_training_params(self.training_params, training_params)
+        with self._train_lock:
+            return self._train_model(df, dataset_path, params)
+    
+    def _train_model(self, df, dataset_path, params):
+        if params['mode'] == 'streaming':
+            return self._train_streaming(df, dataset_path, params)
+        
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        
         if df is None:
             # Try to load from dataset
             if dataset_path:
@@ -290,35 +608,195 @@ class MLPriorityPredictor:
                 print("No dataset available. Generating sample data...")
                 df = self.generate_sample_data()
         
+        start = time.perf_counter()
+        
         # Prepare features
-        X = self.prepare_features(df)
-        y = df['priority'].values
+        X, tfidf_vectorizer, category_encoder = self.prepare_features(df, max_features=params['max_features'])
+        y = df['priority'].to_numpy(dtype=object)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Train model
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42, max_depth=10)
-        self.model.fit(X_train, y_train)
-        
-        # Save model
-        joblib.dump(self.model, self.model_path)
-        joblib.dump(self.tfidf_vectorizer, self.vectorizer_path)
-        joblib.dump(self.category_encoder, self.encoder_path)
+        model = RandomForestClassifier(n_estimators=params['n_estimators'], random_state=42,
+                                       max_depth=params['max_depth'], n_jobs=params['n_jobs'])
+        model.fit(X_train, y_train)
         
         # Calculate accuracy
-        accuracy = self.model.score(X_test, y_test)
-        print(f"Model trained with accuracy: {accuracy:.2f}")
+        accuracy = model.score(X_test, y_test)
+        training_seconds = time.perf_counter() - start
+        
+        # Predict single-threaded unless a large batch asks for more cores
+        model.n_jobs = None
+        
+        state = ModelState(model, tfidf_vectorizer, category_encoder)
+        return self._finish_training(state, accuracy, training_seconds, len(df), params)
+    
+    def _train_streaming(self, df, dataset_path, params):
+        """
+        Train incrementally on chunks of the dataset
+        
+        Text is featurized with a stateless HashingVectorizer, so nothing has
+        to be fitted up front, and a linear model is updated with partial_fit
+        one chunk at a time; memory use depends on the chunk size, not the
+        dataset size. Every fifth row is held out for scoring until
+        chunk_size rows have been set aside.
+        """
+        import numpy as np
+        from scipy.sparse import vstack
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+        
+        chunk_size = params['chunk_size']
+        dataset_path = dataset_path or self.dataset_path
+        if df is None and dataset_path and os.path.exists(dataset_path):
+            chunks = self.iter_dataset_chunks(dataset_path, chunk_size)
+        else:
+            if df is None:
+                print("No dataset available. Generating sample data...")
+                df = self.generate_sample_data()
+            chunks = (df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+        
+        start = time.perf_counter()
+        
+        vectorizer = HashingVectorizer(n_features=params['hash_features'], stop_words='english',
+                                       alternate_sign=False)
+        model = SGDClassifier(loss='log_loss', random_state=42)
+        classes = np.array(['High', 'Low', 'Medium'])
+        
+        n_samples = 0
+        holdout_X, holdout_y, n_held_out = [], [], 0
+        for chunk in chunks:
+            X = vectorizer.transform(chunk['category'].astype(str) + ' ' + chunk['description'].astype(str))
+            y = chunk['priority'].to_numpy(dtype=object)
+            n_samples += len(y)
+            
+            if n_held_out < chunk_size:
+                test = np.arange(len(y)) % 5 == 0
+                holdout_X.append(X[test])
+                holdout_y.append(y[test])
+                n_held_out += int(test.sum())
+                X, y = X[~test], y[~test]
+            
+            if len(y):
+                model.partial_fit(X, y, classes=classes)
+        
+        if not hasattr(model, 'coef_'):
+            raise ValueError("Not enough valid records to train on")
+        
+        accuracy = model.score(vstack(holdout_X), np.concatenate(holdout_y))
+        training_seconds = time.perf_counter() - start
+        
+        state = ModelState(model, vectorizer, None)
+        return self._finish_training(state, accuracy, training_seconds, n_samples, params)
+    
+    def _finish_training(self, state, accuracy, training_seconds, n_samples, params):
+        """Save a newly trained model state, swap it in and record the run"""
+        self.save_bundle(state)
+        self._set_state(state)
+        
+        self.last_training = {
+            'accuracy': accuracy,
+            'training_seconds': training_seconds,
+            'n_samples': n_samples,
+            'params': params
+        }
+        print(f"Model trained with accuracy: {accuracy:.2f} on {n_samples} records in {training_seconds:.2f}s")
         
         return accuracy
     
+    def save_bundle(self, state=None):
+        """
+        Save model, vectorizer and encoder as one versioned bundle
+        
+        The bundle is written uncompressed so its arrays can be memory-mapped,
+        and swapped in with an atomic rename so readers never see a partial file.
+        
+        Args:
+            state: ModelState to save (defaults to the current one); its
+                   model_version is assigned here
+        """
+        import joblib
+        import sklearn
+        
+        state = state or self._state
+        state.model_version = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+        manifest = {
+            'format': MODEL_BUNDLE_FORMAT,
+            'model_version': state.model_version,
+            'created_at': datetime.utcnow().isoformat(),
+            'sklearn_version': sklearn.__version__,
+            'n_features': count_features(state.tfidf_vectorizer, state.category_encoder),
+            'categories': [str(c) for c in getattr(state.category_encoder, 'classes_', [])],
+            'classes': [str(c) for c in state.model.classes_]
+        }
+        bundle = {
+            'manifest': manifest,
+            'model': state.model,
+            'tfidf_vectorizer': state.tfidf_vectorizer,
+            'category_encoder': state.category_encoder
+        }
+        
+        tmp_path = f"{self.bundle_path}.{os.getpid()}.tmp"
+        joblib.dump(bundle, tmp_path)
+        os.replace(tmp_path, self.bundle_path)
+    
+    def _check_bundle(self, manifest, model, tfidf_vectorizer, category_encoder):
+        """Raise ValueError if the bundle pieces do not belong together"""
+        import sklearn
+        
+        if manifest.get('format') != MODEL_BUNDLE_FORMAT:
+            raise ValueError(f"unsupported bundle format {manifest.get('format')}")
+        if manifest.get('sklearn_version') != sklearn.__version__:
+            raise ValueError(f"built with scikit-learn {manifest.get('sklearn_version')}, running {sklearn.__version__}")
+        
+        n_features = count_features(tfidf_vectorizer, category_encoder)
+        if model.n_features_in_ != n_features:
+            raise ValueError(f"vectorizer produces {n_features} features, model expects {model.n_features_in_}")
+        if manifest.get('n_features') != n_features:
+            raise ValueError(f"manifest lists {manifest.get('n_features')} features, vectorizer produces {n_features}")
+        if [str(c) for c in getattr(category_encoder, 'classes_', [])] != manifest.get('categories'):
+            raise ValueError("category encoder does not match the manifest")
+        if [str(c) for c in model.classes_] != manifest.get('classes'):
+            raise ValueError("model classes do not match the manifest")
+    
+    def _load_legacy_model(self):
+        """Load the separate files of older versions and migrate them to a bundle"""
+        import joblib
+        
+        model = joblib.load(self.model_path)
+        tfidf_vectorizer = joblib.load(self.vectorizer_path)
+        category_encoder = joblib.load(self.encoder_path)
+        
+        if model.n_features_in_ != len(tfidf_vectorizer.vocabulary_) + 1:
+            print("Rejecting legacy model files: vectorizer and model do not match")
+            return False
+        
+        state = ModelState(model, tfidf_vectorizer, category_encoder)
+        self.save_bundle(state)
+        self._set_state(state)
+        return True
+    
     def load_model(self):
         """Load trained model"""
-        if os.path.exists(self.model_path):
-            self.model = joblib.load(self.model_path)
-            self.tfidf_vectorizer = joblib.load(self.vectorizer_path)
-            self.category_encoder = joblib.load(self.encoder_path)
+        import joblib
+        
+        if os.path.exists(self.bundle_path):
+            # Memory-mapped so worker processes can share pages via the OS page cache
+            bundle = joblib.load(self.bundle_path, mmap_mode='r')
+            manifest = bundle.get('manifest', {})
+            try:
+                self._check_bundle(manifest, bundle['model'], bundle['tfidf_vectorizer'], bundle['category_encoder'])
+            except (ValueError, KeyError, AttributeError) as e:
+                print(f"Rejecting model bundle {self.bundle_path}: {e}")
+                return False
+            
+            self._set_state(ModelState(bundle['model'], bundle['tfidf_vectorizer'],
+                                       bundle['category_encoder'], manifest['model_version']))
             return True
+        
+        if all(os.path.exists(path) for path in [self.model_path, self.vectorizer_path, self.encoder_path]):
+            return self._load_legacy_model()
         return False
     
     def initialize_model(self, force_retrain=False):
@@ -328,67 +806,154 @@ class MLPriorityPredictor:
         Args:
             force_retrain: If True, retrain model even if it exists
         """
+        start = time.perf_counter()
         if force_retrain or not self.load_model():
             print("Training new model...")
             self.train_model()
         else:
             print("Model loaded successfully")
+        self.load_seconds = time.perf_counter() - start
     
-    def retrain_with_dataset(self, dataset_path=None):
+    def ensure_model(self):
+        """
+        Load (or train) the model on first use
+        
+        Safe to call from several threads; only the first caller loads the
+        model and the others wait for it.
+        """
+        if self._ready.is_set():
+            return
+        with self._init_lock, timed('model_load'):
+            if not self._ready.is_set():
+                self.initialize_model()
+    
+    @property
+    def is_ready(self):
+        """True once the model, vectorizer and encoder are all loaded"""
+        return self._ready.is_set()
+    
+    def retrain_with_dataset(self, dataset_path=None, training_params=None):
         """
         Retrain the model with a new dataset
         
         Args:
             dataset_path: Path to new dataset file
+            training_params: Overrides of self.training_params for this run
         """
         print("Retraining model with dataset...")
         if dataset_path:
             self.dataset_path = dataset_path
-        accuracy = self.train_model()
+        accuracy = self.train_model(training_params=training_params)
         print(f"Model retrained successfully with accuracy: {accuracy:.2f}")
         return accuracy
     
-    def predict_priority(self, category, description, location):
-        """Predict priority for a new request"""
-        if self.model is None:
-            self.initialize_model()
-        
-        # Prepare input
-        text = f"{category} {description}"
-        text_features = self.tfidf_vectorizer.transform([text])
-        
-        try:
-            category_encoded = self.category_encoder.transform([category])[0]
-        except ValueError:
-            # If category not in training data, use a default encoding
-            category_encoded = 0
-        
+    def _build_features(self, state, categories, descriptions):
+        """Build the sparse feature matrix for a batch of requests"""
+        import numpy as np
         from scipy.sparse import hstack
-        features = hstack([text_features, [[category_encoded]]])
-        
-        # Predict
-        prediction = self.model.predict(features)[0]
-        probabilities = self.model.predict_proba(features)[0]
-        confidence = max(probabilities)
         
-        # Get explanation
-        explanation = self._generate_explanation(category, description, prediction, confidence)
+        texts = [f"{category} {description}" for category, description in zip(categories, descriptions)]
+        text_features = state.tfidf_vectorizer.transform(texts)
+        if state.category_encoder is None:
+            # Streaming models hash the category together with the description
+            return text_features.tocsr()
+        
+        # Encode all categories in one pass; categories unseen during training
+        # fall back to the default encoding of 0, same as a single prediction
+        classes = state.category_encoder.classes_
+        categories = np.asarray(categories, dtype=object)
+        positions = np.searchsorted(classes, categories)
+        positions = np.clip(positions, 0, len(classes) - 1)
+        category_encoded = np.where(classes[positions] == categories, positions, 0)
+        
+        return hstack([text_features, category_encoded.reshape(-1, 1)]).tocsr()
+    
+    def predict_priority_batch(self, records):
+        """
+        Predict priorities for many requests at once
         
-        return {
-            'priority': prediction,
-            'confidence': float(confidence),
-            'explanation': explanation
-        }
+        Args:
+            records: Iterable of dicts with 'category', 'description' and
+                     optional 'location' keys
+            
+        Returns:
+            List of dicts with priority, confidence and explanation, one per record
+        """
+        self.ensure_model()
+        
+        records = list(records)
+        if not records:
+            return []
+        
+        # Read the state once; a retrain may swap in a new one meanwhile
+        state = self._state
+        
+        categories = [str(r.get('category') or '') for r in records]
+        descriptions = [str(r.get('description') or '') for r in records]
+        
+        cache = self.prediction_cache
+        if cache is None:
+            return self._predict_uncached(state, categories, descriptions)
+        
+        with timed('cache_lookup'):
+            keys = [cache.key(category, description, state.model_version)
+                    for category, description in zip(categories, descriptions)]
+            results = [cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            predicted = self._predict_uncached(state, [categories[i] for i in missing],
+                                               [descriptions[i] for i in missing])
+            for i, result in zip(missing, predicted):
+                cache.put(keys[i], result, state.model_version)
+                results[i] = result
+        # Deep copies, so callers cannot change the cached entries or their keyword lists
+        return [copy.deepcopy(result) for result in results]
+    
+    def _predict_uncached(self, state, categories, descriptions):
+        """Run the model for a batch of requests"""
+        import numpy as np
+        
+        with timed('feature_transform'):
+            features = self._build_features(state, categories, descriptions)
+        
+        # A single forest pass; the label is the argmax of the probabilities,
+        # which is exactly what RandomForestClassifier.predict computes
+        with timed('model_predict'):
+            if len(categories) >= PARALLEL_PREDICT_MIN_ROWS:
+                from joblib import parallel_config
+                with parallel_config(n_jobs=self.training_params['n_jobs']):
+                    probabilities = state.model.predict_proba(features)
+            else:
+                probabilities = state.model.predict_proba(features)
+            best = probabilities.argmax(axis=1)
+            predictions = state.model.classes_[best]
+            confidences = probabilities[np.arange(len(categories)), best]
+        
+        results = []
+        with timed('explanation'):
+            for category, description, prediction, confidence in zip(categories, descriptions, predictions, confidences):
+                keyword_hits = self.match_priority_keywords(description)
+                results.append({
+                    'priority': str(prediction),
+                    'confidence': float(confidence),
+                    'explanation': self._generate_explanation(category, description, prediction, confidence, keyword_hits),
+                    'matched_keywords': keyword_hits
+                })
+        return results
     
-    def _generate_explanation(self, category, description, priority, confidence):
+    def predict_priority(self, category, description, location):
+        """Predict priority for a new request"""
+        return self.predict_priority_batch([{
+            'category': category,
+            'description': description,
+            'location': location
+        }])[0]
+    
+    def _generate_explanation(self, category, description, priority, confidence, keyword_hits=None):
         """Generate explanation for the prediction"""
-        description_lower = description.lower()
-        
-        # Find matching keywords
-        matched_keywords = []
-        for keyword in self.priority_keywords.get(priority, []):
-            if keyword in description_lower:
-                matched_keywords.append(keyword)
+        if keyword_hits is None:
+            keyword_hits = self.match_priority_keywords(description)
+        matched_keywords = keyword_hits.get(priority, [])
         
         explanation_parts = []
         
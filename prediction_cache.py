@@ -0,0 +1,129 @@
+"""
+In-process cache of ML predictions for repeated complaints.
+
+Entries are keyed on a hash of the request text as the model sees it plus
+the model version, so a retrained model never serves predictions of the old one.
+An optional SQLite file lets several worker processes share entries.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+class PredictionCache:
+    """LRU cache of prediction results with a TTL and hit/miss counters"""
+
+    def __init__(self, max_size=10000, ttl=3600, store_path=None):
+        """
+        Args:
+            max_size: Maximum number of entries kept in memory
+            ttl: Seconds an entry stays valid (0 for no expiry)
+            store_path: Optional SQLite file shared by worker processes
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store_path = store_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if store_path:
+            store = self._store()
+            store.execute('CREATE TABLE IF NOT EXISTS predictions '
+                          '(key TEXT PRIMARY KEY, model_version TEXT, value TEXT NOT NULL, created REAL NOT NULL)')
+            store.execute('CREATE INDEX IF NOT EXISTS ix_predictions_created ON predictions (created)')
+
+    @staticmethod
+    def key(category, description, model_version):
+        """
+        Cache key of a request
+
+        The category is kept exactly, since the category encoder is case
+        sensitive. The description is only lowercased, which is exactly the
+        text the keyword matcher and the vectorizer see; collapsing
+        whitespace would merge descriptions whose keyword matches differ.
+        """
+        text = '\x1f'.join([str(model_version), str(category or ''), str(description or '').lower()])
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _store(self):
+        """Per-thread connection to the shared store"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.store_path, timeout=5, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def _expired(self, created):
+        return bool(self.ttl) and time.time() - created > self.ttl
+
+    def get(self, key):
+        """Cached result for a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.store_path:
+            row = self._store().execute('SELECT value, created FROM predictions WHERE key = ?', (key,)).fetchone()
+            if row is not None and not self._expired(row[1]):
+                value = json.loads(row[0])
+                self._remember(key, value, row[1])
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, value, created):
+        with self._lock:
+            self._entries[key] = (created, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def put(self, key, value, model_version=None):
+        """Cache a result"""
+        created = time.time()
+        self._remember(key, value, created)
+        if self.store_path:
+            store = self._store()
+            store.execute('INSERT OR REPLACE INTO predictions (key, model_version, value, created) VALUES (?, ?, ?, ?)',
+                          (key, model_version, json.dumps(value), created))
+            if self.ttl:
+                store.execute('DELETE FROM predictions WHERE created < ?', (created - self.ttl,))
+
+    def clear(self, model_version=None):
+        """
+        Drop cached entries, e.g. after the model was retrained
+
+        Args:
+            model_version: If given, shared entries of this model version are
+                           kept; all entries in memory are always dropped
+        """
+        with self._lock:
+            self._entries.clear()
+        if self.store_path:
+            self._store().execute('DELETE FROM predictions WHERE model_version IS NOT ?', (model_version,))
+
+    def stats(self):
+        """Hit and miss counters and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
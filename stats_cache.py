@@ -0,0 +1,99 @@
+"""
+In-process cache of the dashboard aggregates shown by index() and /api/stats.
+
+Counters are rebuilt from one GROUP BY query and then maintained
+incrementally on every insert, status change and priority override.
+"""
+from collections import Counter
+import hashlib
+import json
+import threading
+import time
+
+class StatsCache:
+    """Incrementally maintained request counts by status, category and priority"""
+
+    def __init__(self, loader, ttl=60):
+        """
+        Args:
+            loader: Callable returning (status, category, priority, count) rows
+            ttl: Seconds after which the counters are rebuilt from the database,
+                 so writes made by other worker processes are picked up
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._total = 0
+        self._statuses = Counter()
+        self._categories = Counter()
+        self._priorities = Counter()
+
+    def rebuild(self):
+        """Recompute all counters from scratch"""
+        rows = self.loader()
+        with self._lock:
+            self._statuses = Counter()
+            self._categories = Counter()
+            self._priorities = Counter()
+            for status, category, priority, count in rows:
+                self._statuses[status] += count
+                self._categories[category] += count
+                self._priorities[priority] += count
+            self._total = sum(self._statuses.values())
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None or (self.ttl and time.monotonic() - self._loaded_at > self.ttl):
+            self.rebuild()
+
+    def invalidate(self):
+        """Rebuild the counters from the database on the next read"""
+        with self._lock:
+            self._loaded_at = None
+
+    def record_insert(self, status, category, priority, count=1):
+        """Account for newly inserted requests"""
+        with self._lock:
+            self._total += count
+            self._statuses[status] += count
+            self._categories[category] += count
+            self._priorities[priority] += count
+
+    def record_status_change(self, old_status, new_status):
+        """Account for a request moving from one status to another"""
+        if old_status == new_status:
+            return
+        with self._lock:
+            self._statuses[old_status] -= 1
+            self._statuses[new_status] += 1
+
+    def record_priority_change(self, old_priority, new_priority):
+        """Account for a request's priority being overridden"""
+        if old_priority == new_priority:
+            return
+        with self._lock:
+            self._priorities[old_priority] -= 1
+            self._priorities[new_priority] += 1
+
+    def get(self):
+        """
+        Get the current aggregates
+
+        Returns:
+            Tuple of (stats dict, etag string). The etag is a hash of the
+            stats, so it is the same in every worker process and across
+            restarts while the counts are unchanged
+        """
+        self._ensure_fresh()
+        with self._lock:
+            stats = {
+                'total': self._total,
+                'pending': self._statuses['Pending'],
+                'in_progress': self._statuses['In-Progress'],
+                'completed': self._statuses['Completed'],
+                'categories': {cat: count for cat, count in self._categories.items() if count},
+                'priorities': {priority: count for priority, count in self._priorities.items() if count}
+            }
+        etag = hashlib.sha1(json.dumps(stats, sort_keys=True).encode()).hexdigest()[:16]
+        return stats, etag
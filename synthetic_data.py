@@ -0,0 +1,353 @@
+"""
+Synthetic service request generator for load tests.
+
+Usage:
+    python synthetic_data.py <output.csv|.parquet|db> <n_rows> [seed] [chunk_size]
+
+Rows are generated a chunk at a time with numpy, so millions of requests
+take seconds and constant memory. Categories, priorities and keywords
+follow the same patterns as the built-in sample data and the KRR rules,
+reports cluster on a few busy streets and addresses (which exercises the
+location frequency signal), and creation times follow a daytime-heavy
+hourly profile. With the same seed and chunk size the output is identical.
+
+Writing to 'db' inserts the rows into the app database with their
+generated priority as the ML priority, without running the model.
+"""
+import os
+import sys
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 100000
+
+PRIORITIES = ['High', 'Medium', 'Low']
+
+# Category -> (share of requests, probabilities of High/Medium/Low)
+CATEGORY_PROFILES = {
+    'Waste collection': (0.24, [0.30, 0.45, 0.25]),
+    'Streetlight issue': (0.20, [0.35, 0.45, 0.20]),
+    'Road repair': (0.18, [0.35, 0.45, 0.20]),
+    'Noise complaint': (0.12, [0.10, 0.50, 0.40]),
+    'Water service issue': (0.12, [0.40, 0.40, 0.20]),
+    'Graffiti removal': (0.08, [0.05, 0.35, 0.60]),
+    'Others': (0.06, [0.05, 0.30, 0.65])
+}
+
+# Phrases by category and priority; High phrases carry the urgency
+# keywords the ML explanations and KRR rules look for
+PHRASES = {
+    'Waste collection': {
+        'High': ['Garbage is overflowing and blocking the road', 'Trash overflowing everywhere, health hazard',
+                 'Overflowing bins blocking the sidewalk', 'Rotting waste piled up, urgent health concern'],
+        'Medium': ['Garbage collection missed this week', 'Bins not emptied, needs pickup',
+                   'Recycling was not collected', 'Missed pickup on our street'],
+        'Low': ['Request for additional bin', 'Question about the collection schedule',
+                'Request for a recycling bin', 'General inquiry about bulk pickup']
+    },
+    'Streetlight issue': {
+        'High': ['Streetlight is broken and the area is completely dark, dangerous at night',
+                 'No lights working, dangerous for pedestrians', 'Fallen light pole, safety hazard',
+                 'Whole block is dark, unsafe at night'],
+        'Medium': ['Streetlight flickering, needs maintenance', 'Light not working at the corner',
+                   'Streetlight stays on during the day', 'Dim streetlight needs repair'],
+        'Low': ['Request for a new streetlight', 'Question about streetlight repair schedule',
+                'Streetlight cover is loose', 'General inquiry about lighting']
+    },
+    'Road repair': {
+        'High': ['Large pothole causing accidents, immediate repair needed', 'Road collapsed, dangerous for traffic',
+                 'Deep pothole damaged several cars', 'Sinkhole in the road, urgent'],
+        'Medium': ['Road needs repair, some potholes present', 'Cracked pavement needs maintenance',
+                   'Pothole forming near the intersection', 'Uneven road surface is a problem'],
+        'Low': ['Minor road maintenance needed', 'Request to repaint lane markings',
+                'Small crack in the road', 'Question about road resurfacing']
+    },
+    'Noise complaint': {
+        'High': ['Loud explosions at night, residents in danger', 'Dangerous fireworks in the street every night',
+                 'Extreme noise from illegal party, urgent'],
+        'Medium': ['Loud noise from construction site', 'Disturbance from a bar every weekend',
+                   'Loud music from neighbor late at night', 'Construction noise before permitted hours'],
+        'Low': ['Minor noise from neighbor', 'Barking dog in the afternoon',
+                'Question about noise regulations', 'Occasional noise from a shop']
+    },
+    'Water service issue': {
+        'High': ['Water pipe burst flooding the street, urgent attention required', 'Main leak flooding the basement',
+                 'Water emergency, no water in the building', 'Flooding from a broken hydrant'],
+        'Medium': ['Water pressure is low', 'Small leak near the meter',
+                   'Water is discolored, needs inspection', 'Dripping hydrant needs repair'],
+        'Low': ['Question about the water bill', 'Request for a water quality report',
+                'General inquiry about water service', 'Request to move the water meter']
+    },
+    'Graffiti removal': {
+        'High': ['Offensive graffiti on the school wall, urgent removal', 'Graffiti covering traffic signs, safety hazard'],
+        'Medium': ['Graffiti on public wall needs removal', 'Graffiti on the bus shelter',
+                   'Tagging on the underpass needs cleaning'],
+        'Low': ['Small graffiti on wall', 'Faded graffiti on a fence', 'Request to paint over old graffiti']
+    },
+    'Others': {
+        'High': ['Fallen tree blocking the road, dangerous', 'Open manhole, immediate safety hazard',
+                 'Downed power line, emergency'],
+        'Medium': ['Broken bench in the park needs repair', 'Damaged sign needs replacement',
+                   'Abandoned vehicle parked for weeks'],
+        'Low': ['General inquiry about services', 'Request for information on permits',
+                'Question about park opening hours', 'Request for a new bench']
+    }
+}
+
+# Optional detail appended to a phrase ('' leaves it as is)
+DETAILS = ['', '', '', '', ' near the school', ' since last week', ' for several days', ' again',
+           ' in front of my house', ' at the corner', ' by the bus stop', ' next to the park',
+           ', please help', ', reported before', ' this morning', ' every evening']
+
+STREET_NAMES = ['Main', 'Oak', 'Maple', 'Elm', 'Pine', 'Cedar', 'Park', 'Lake', 'Hill', 'Washington',
+                'Lincoln', 'Jefferson', 'Madison', 'Franklin', 'Church', 'Market', 'Mill', 'River',
+                'Spring', 'Center', 'Highland', 'Union', 'Walnut', 'Chestnut', 'Willow', 'Sunset',
+                'Jackson', 'Adams', 'Grant', 'Monroe', 'First', 'Second', 'Third', 'Fourth', 'Fifth',
+                'Sixth', 'Seventh', 'Eighth', 'Ninth', 'Tenth']
+STREET_SUFFIXES = ['Street', 'Avenue', 'Road', 'Drive', 'Lane']
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+               'Elizabeth', 'Maria', 'Ahmed', 'Wei', 'Priya', 'Carlos', 'Fatima', 'Olga', 'Kenji']
+LAST_NAMES = ['Smith', 'Johnson', 'Garcia', 'Brown', 'Lee', 'Patel', 'Nguyen', 'Kim', 'Lopez', 'Khan',
+              'Martin', 'Novak', 'Silva', 'Cohen', 'Okafor', 'Rossi']
+
+# Relative number of requests created in each hour of the day
+HOURLY_PROFILE = [1, 1, 1, 1, 1, 2, 4, 7, 9, 10, 10, 9, 9, 9, 9, 9, 9, 8, 7, 6, 5, 4, 3, 2]
+
+def _street_table():
+    """All streets with Zipf-like request shares and a busy address on each"""
+    streets = np.array([f"{name} {suffix}" for suffix in STREET_SUFFIXES for name in STREET_NAMES], dtype=object)
+    # A few streets get most of the reports
+    ranks = np.arange(1, len(streets) + 1)
+    shares = 1.0 / ranks ** 1.1
+    hotspots = (np.arange(len(streets)) * 37 % 90 + 1) * 100 + 15
+    return streets, shares / shares.sum(), hotspots
+
+def _phrase_table():
+    """Flattened phrases with the offset and count of each (category, priority) group"""
+    phrases, offsets, counts = [], [], []
+    for category in CATEGORY_PROFILES:
+        for priority in PRIORITIES:
+            group = PHRASES[category][priority]
+            offsets.append(len(phrases))
+            counts.append(len(group))
+            phrases.extend(group)
+    return np.array(phrases, dtype=object), np.array(offsets), np.array(counts)
+
+def _pick(rng, cumulative, rows):
+    """Vectorized categorical draw: index of the first cumulative probability above a uniform sample"""
+    samples = rng.random(len(rows))
+    return (samples[:, None] >= cumulative[rows]).sum(axis=1).clip(max=cumulative.shape[1] - 1)
+
+def generate_requests(n_rows, seed=None, days=365, end=None, label_noise=0.1, rng=None):
+    """
+    Generate synthetic service requests
+
+    Args:
+        n_rows: Number of requests
+        seed: Random seed for reproducible output
+        days: Requests are created over this many days before end
+        end: Latest creation time (defaults to now)
+        label_noise: Share of requests described with a phrase of a
+                     different priority, as real reports are not always
+                     worded to match their urgency
+        rng: numpy Generator to draw from instead of a new one from seed
+
+    Returns:
+        DataFrame with name, category, description, location, priority,
+        status and created_at columns
+    """
+    rng = rng or np.random.default_rng(seed)
+    end = end or datetime.utcnow()
+    categories = list(CATEGORY_PROFILES)
+    category_shares = np.array([CATEGORY_PROFILES[c][0] for c in categories])
+    priority_cumulative = np.cumsum([CATEGORY_PROFILES[c][1] for c in categories], axis=1)
+    phrases, offsets, counts = _phrase_table()
+    streets, street_shares, hotspots = _street_table()
+    details = np.array(DETAILS, dtype=object)
+
+    category_idx = rng.choice(len(categories), n_rows, p=category_shares / category_shares.sum())
+    priority_idx = _pick(rng, priority_cumulative, category_idx)
+
+    # The phrase usually matches the priority; with label_noise it is drawn
+    # from another priority of the same category
+    phrase_priority = np.where(rng.random(n_rows) < label_noise,
+                               (priority_idx + rng.integers(1, len(PRIORITIES), n_rows)) % len(PRIORITIES),
+                               priority_idx)
+    group = category_idx * len(PRIORITIES) + phrase_priority
+    phrase_idx = offsets[group] + (rng.random(n_rows) * counts[group]).astype(int)
+    description = phrases[phrase_idx] + details[rng.integers(0, len(details), n_rows)]
+
+    # Locations cluster on busy streets, and a third of a street's reports
+    # come from its hotspot address
+    street_idx = rng.choice(len(streets), n_rows, p=street_shares)
+    house_number = np.where(rng.random(n_rows) < 0.3, hotspots[street_idx],
+                            rng.integers(1, 100, n_rows) * 100 + rng.integers(1, 100, n_rows))
+    location = house_number.astype(str).astype(object) + ' ' + streets[street_idx]
+
+    # A random day before the day of end, at an hour drawn from the hourly profile
+    hours = np.array(HOURLY_PROFILE, dtype=float)
+    seconds = (rng.choice(24, n_rows, p=hours / hours.sum()) * 3600 + rng.integers(0, 3600, n_rows)
+               - rng.integers(1, days + 1, n_rows) * 86400)
+    created_at = pd.Timestamp(end).normalize() + pd.to_timedelta(seconds, unit='s')
+
+    # Older requests are more likely to be resolved
+    age_days = (pd.Timestamp(end) - created_at).total_seconds().to_numpy() / 86400
+    completed = rng.random(n_rows) < np.minimum(0.9, age_days / 30)
+    in_progress = ~completed & (rng.random(n_rows) < 0.3)
+    status = np.where(completed, 'Completed', np.where(in_progress, 'In-Progress', 'Pending'))
+
+    first_names = np.array(FIRST_NAMES, dtype=object)
+    last_names = np.array(LAST_NAMES, dtype=object)
+    name = first_names[rng.integers(0, len(first_names), n_rows)] + ' ' + last_names[rng.integers(0, len(last_names), n_rows)]
+
+    return pd.DataFrame({
+        'name': name,
+        'category': np.array(categories, dtype=object)[category_idx],
+        'description': description,
+        'location': location,
+        'priority': np.array(PRIORITIES, dtype=object)[priority_idx],
+        'status': status.astype(object),
+        'created_at': created_at
+    })
+
+def iter_request_chunks(n_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, **kwargs):
+    """
+    Generate synthetic requests chunk by chunk
+
+    Args:
+        n_rows: Total number of requests
+        chunk_size: Requests per chunk
+        seed: Random seed; one generator is shared by all chunks
+        **kwargs: Passed on to generate_requests
+
+    Yields:
+        DataFrames of at most chunk_size requests
+    """
+    rng = np.random.default_rng(seed)
+    kwargs.setdefault('end', datetime.utcnow())
+    for start in range(0, n_rows, chunk_size):
+        yield generate_requests(min(chunk_size, n_rows - start), rng=rng, **kwargs)
+
+def write_requests(output_file, n_rows, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    Write synthetic requests to a CSV or Parquet file
+
+    Args:
+        output_file: Path ending in .csv or .parquet
+        n_rows: Number of requests
+        seed: Random seed for reproducible output
+        chunk_size: Requests generated and written at a time
+        **kwargs: Passed on to generate_requests
+
+    Returns:
+        Number of rows written
+    """
+    file_ext = os.path.splitext(output_file)[1].lower()
+    if file_ext not in ['.csv', '.parquet']:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+    # Written to a temporary file first so an interrupted run never leaves
+    # a truncated dataset behind
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    writer = None
+    total = 0
+    try:
+        for chunk in iter_request_chunks(n_rows, chunk_size, seed, **kwargs):
+            chunk['created_at'] = chunk['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')
+            if file_ext == '.csv':
+                chunk.to_csv(tmp_file, mode='a' if total else 'w', header=not total, index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk.astype(str), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_file, table.schema)
+                writer.write_table(table)
+            total += len(chunk)
+        if writer is not None:
+            writer.close()
+            writer = None
+        os.replace(tmp_file, output_file)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return total
+
+def insert_requests(n_rows, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, advise=True, **kwargs):
+    """
+    Bulk insert synthetic requests into the app database, one transaction per chunk
+
+    The generated priority is stored as the ML priority with a random
+    confidence; the model is not run. Call inside an app context.
+
+    Args:
+        n_rows: Number of requests
+        seed: Random seed for reproducible output
+        chunk_size: Requests per transaction
+        advise: Fill in the KRR advisory of every request
+        **kwargs: Passed on to generate_requests
+
+    Returns:
+        Number of rows inserted
+    """
+    from app import db, krr_engine, stats_cache, ServiceRequest, PRIORITY_RANKS
+
+    confidence_rng = np.random.default_rng(None if seed is None else seed + 1)
+    total = 0
+    for chunk in iter_request_chunks(n_rows, chunk_size, seed, **kwargs):
+        chunk['updated_at'] = chunk['created_at']
+        chunk['ml_priority'] = chunk.pop('priority')
+        chunk['priority_rank'] = chunk['ml_priority'].map(PRIORITY_RANKS)
+        chunk['ml_confidence'] = confidence_rng.uniform(0.4, 1.0, len(chunk)).round(4)
+        chunk['ml_explanation'] = 'Synthetic request'
+        if advise:
+            chunk['krr_advisory'] = [krr_engine.get_advisory(category, description, location)
+                                     for category, description, location
+                                     in zip(chunk['category'], chunk['description'], chunk['location'])]
+        db.session.execute(db.insert(ServiceRequest), chunk.to_dict('records'))
+        db.session.commit()
+        total += len(chunk)
+    stats_cache.rebuild()
+    return total
+
+def main(argv):
+    if len(argv) < 3:
+        print("Usage:")
+        print("  python synthetic_data.py <output.csv|.parquet|db> <n_rows> [seed] [chunk_size]")
+        print("\nExample:")
+        print("  python synthetic_data.py load_test.parquet 1000000 42")
+        print("  python synthetic_data.py db 1000000 42")
+        return 1
+
+    target = argv[1]
+    n_rows = int(argv[2])
+    seed = int(argv[3]) if len(argv) > 3 else None
+    chunk_size = int(argv[4]) if len(argv) > 4 else DEFAULT_CHUNK_SIZE
+
+    if target == 'db':
+        # Imported lazily so files can be generated without the web app
+        from app import app, db, migrate_database
+
+        with app.app_context():
+            db.create_all()
+            migrate_database()
+            total = insert_requests(n_rows, seed, chunk_size)
+        print(f"Inserted {total} synthetic requests into {app.config['SQLALCHEMY_DATABASE_URI']}")
+        return 0
+
+    try:
+        total = write_requests(target, n_rows, seed, chunk_size)
+    except (ValueError, ImportError) as e:
+        print(f"Error generating dataset: {e}")
+        return 1
+    print(f"Generated {total} synthetic requests")
+    print(f"Saved to: {target}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
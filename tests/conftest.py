@@ -0,0 +1,29 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py reads its settings on import; keep the test database out of the
+# working tree and never load or train the model unless a test asks for it
+os.environ.update({
+    'DATABASE_URL': 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='triage-tests-'), 'test.db'),
+    'MODEL_LOADING': 'lazy',
+    'PREDICTION_CACHE_SIZE': '0',
+    'ASYNC_TRIAGE': '0'
+})
+
+@pytest.fixture
+def app_db():
+    """The app database, emptied and migrated, inside an app context"""
+    from app import app, db, migrate_database
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        migrate_database()
+        yield db
+        db.session.remove()
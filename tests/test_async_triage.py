@@ -0,0 +1,130 @@
+"""
+Async triage: /submit stores a request as 'Scoring' and the worker pool scores it
+"""
+import threading
+import time
+
+import pytest
+
+from triage_worker import TriageWorker
+
+SUBMISSION = {'name': 'Ana', 'location': '1 Main', 'category': 'Waste collection',
+              'description': 'Overflowing bin blocking the sidewalk'}
+
+@pytest.fixture
+def async_app(app_db, monkeypatch):
+    """The app in async triage mode, with a stub model that records its calls"""
+    import app
+
+    calls = []
+
+    def predict(records):
+        calls.append(len(records))
+        return [{'priority': 'High', 'confidence': 0.8, 'explanation': 'Test', 'matched_keywords': {}}
+                for _ in records]
+
+    monkeypatch.setitem(app.app.config, 'ASYNC_TRIAGE', True)
+    # One request per batch, so a request queued twice would be scored twice
+    monkeypatch.setattr(app.triage_worker, 'batch_size', 1)
+    monkeypatch.setattr(app.ml_predictor, 'predict_priority_batch', predict)
+    app.krr_engine.location_counter.rebuild([])
+    app.stats_cache.rebuild()
+    app.model_calls = calls
+    yield app
+    app.triage_worker.stop()
+    del app.model_calls
+
+def poll(client, status_url, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = client.get(status_url).get_json()
+        if not result['scoring']:
+            return result
+        time.sleep(0.02)
+    raise AssertionError(f'{status_url} was still scoring after {timeout}s')
+
+def test_submit_is_scored_and_counted_once(async_app):
+    client = async_app.app.test_client()
+
+    response = client.post('/submit', data=SUBMISSION)
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body['ml_priority'] == 'Scoring'
+
+    result = poll(client, body['status_url'])
+    assert result['ml_priority'] == 'High'
+    assert result['ml_confidence'] == 0.8
+    assert result['krr_advisory']
+
+    async_app.triage_worker.stop()
+    assert async_app.model_calls == [1]
+    assert async_app.krr_engine.location_counter.count('1 Main', 'Waste collection') == 1
+    stats, _ = async_app.stats_cache.get()
+    assert stats['priorities'] == {'High': 1}
+
+def test_concurrent_scoring_claims_each_request_once(async_app, monkeypatch):
+    from app import SCORING_PRIORITY, ServiceRequest, score_pending_requests
+
+    request_obj = ServiceRequest(location='1 Main', category='Waste collection', description='Overflowing bin',
+                                 ml_priority=SCORING_PRIORITY)
+    async_app.db.session.add(request_obj)
+    async_app.db.session.commit()
+    async_app.stats_cache.rebuild()
+
+    # Both workers read the request as 'Scoring' before either writes its score
+    both_read = threading.Barrier(2)
+    predict = async_app.ml_predictor.predict_priority_batch
+
+    def predict_together(records):
+        both_read.wait(timeout=5)
+        return predict(records)
+
+    monkeypatch.setattr(async_app.ml_predictor, 'predict_priority_batch', predict_together)
+    workers = [threading.Thread(target=score_pending_requests, args=([request_obj.id],)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert async_app.model_calls == [1, 1]
+    assert async_app.krr_engine.location_counter.count('1 Main', 'Waste collection') == 1
+    stats, _ = async_app.stats_cache.get()
+    assert stats['priorities'] == {'High': 1}
+
+def test_failing_request_is_marked_unscored(async_app, monkeypatch):
+    def fail(records):
+        raise RuntimeError('model unavailable')
+
+    monkeypatch.setattr(async_app.ml_predictor, 'predict_priority_batch', fail)
+    client = async_app.app.test_client()
+
+    body = client.post('/submit', data=SUBMISSION).get_json()
+    result = poll(client, body['status_url'])
+
+    assert result['ml_priority'] == 'Unscored'
+    assert client.get('/requests?priority=Unscored').status_code == 200
+    stats, _ = async_app.stats_cache.get()
+    assert stats['priorities'] == {'Unscored': 1}
+
+def test_worker_retries_requests_of_a_failed_batch_one_at_a_time():
+    scored, failed = [], []
+    lock = threading.Lock()
+
+    def score(batch):
+        with lock:
+            if 'bad' in batch:
+                raise RuntimeError('cannot score')
+            scored.extend(batch)
+
+    worker = TriageWorker(score, num_workers=1, batch_size=10, batch_wait=0.2, max_attempts=3,
+                          on_failure=failed.extend)
+    for request_id in [1, 'bad', 2]:
+        worker.submit(request_id)
+    worker.start()
+    deadline = time.monotonic() + 5
+    while not failed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop()
+
+    assert sorted(scored) == [1, 2]
+    assert failed == ['bad']
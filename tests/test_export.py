@@ -0,0 +1,89 @@
+"""
+Streaming CSV/NDJSON export of service requests
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+START = datetime(2026, 10, 16, 8, 0)
+
+def add_requests(db, count):
+    from app import ServiceRequest
+
+    for i in range(count):
+        db.session.add(ServiceRequest(location=f'{i} Main Street', category='Others' if i % 2 else 'Road damage',
+                                      description=f'Report, "{i}"\nsecond line', ml_priority='Low',
+                                      ml_confidence=0.5, created_at=START, updated_at=START + timedelta(hours=i)))
+    db.session.commit()
+
+@pytest.fixture
+def client(app_db, monkeypatch):
+    import app
+
+    # Small batches, so the rows are streamed over several chunks
+    monkeypatch.setattr(app, 'EXPORT_BATCH_SIZE', 2)
+    add_requests(app_db, 5)
+    return app.app.test_client()
+
+def test_csv_export(client):
+    from app import EXPORT_COLUMNS
+
+    response = client.get('/api/requests/export')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert 'filename=service_requests.csv' in response.headers['Content-Disposition']
+
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == EXPORT_COLUMNS
+    assert [row[0] for row in rows[1:]] == ['1', '2', '3', '4', '5']
+    first = dict(zip(EXPORT_COLUMNS, rows[1]))
+    assert first['description'] == 'Report, "0"\nsecond line'
+    assert first['updated_at'] == '2026-10-16T08:00:00'
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'jsonl'])
+def test_ndjson_export(client, export_format):
+    from app import EXPORT_COLUMNS
+
+    response = client.get(f'/api/requests/export?format={export_format}')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [record['id'] for record in records] == [1, 2, 3, 4, 5]
+    assert list(records[0]) == EXPORT_COLUMNS
+    assert records[4]['updated_at'] == '2026-10-16T12:00:00'
+    assert records[0]['ml_confidence'] == 0.5
+
+def test_export_applies_listing_filters(client):
+    response = client.get('/api/requests/export?format=ndjson&category=Others')
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [record['id'] for record in records] == [2, 4]
+
+@pytest.mark.parametrize('updated_since, expected', [
+    ('2026-10-16T10:00:00', [3, 4, 5]),
+    ('2026-10-16T10:00:00Z', [3, 4, 5]),
+    ('2026-10-16T12:00:00+02:00', [3, 4, 5]),
+    ('2026-10-16T12:30:00', []),
+])
+def test_updated_since(client, updated_since, expected):
+    response = client.get('/api/requests/export', query_string={'format': 'ndjson', 'updated_since': updated_since})
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [record['id'] for record in records] == expected
+
+@pytest.mark.parametrize('query', [{'updated_since': 'yesterday'}, {'updated_since': '2026-13-01'},
+                                   {'format': 'xml'}])
+def test_invalid_arguments_are_rejected(client, query):
+    response = client.get('/api/requests/export', query_string=query)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_empty_export_has_only_the_header(app_db):
+    from app import app, EXPORT_COLUMNS
+
+    response = app.test_client().get('/api/requests/export')
+    assert response.get_data(as_text=True).splitlines() == [','.join(EXPORT_COLUMNS)]
@@ -0,0 +1,37 @@
+"""
+Sliding-window location frequency counter of the KRR engine
+"""
+from datetime import datetime, timedelta
+
+from krr_engine import LocationFrequencyCounter
+
+def test_counts_reports_inside_the_window():
+    counter = LocationFrequencyCounter(window_days=7)
+    now = datetime.utcnow()
+    for days_ago in [0, 1, 6, 8]:
+        counter.record('12 Main St.', 'Road damage', now - timedelta(days=days_ago))
+
+    assert counter.count('12 main st', 'Road damage') == 3
+    assert counter.count('12 Main St', 'Waste collection') == 0
+
+def test_record_expires_keys_that_are_never_seen_again():
+    counter = LocationFrequencyCounter(window_days=1)
+    old = datetime.utcnow() - timedelta(hours=23, minutes=59, seconds=59)
+    for i in range(1000):
+        counter.record(f'{i} One-off Street', 'Others', old)
+    assert len(counter._timestamps) == 1000
+
+    counter.window = timedelta(hours=1)
+    counter.record('1 Busy Street', 'Others')
+
+    assert list(counter._timestamps) == [('1 busy street', 'Others')]
+    assert len(counter._expiry) == 1
+
+def test_rebuild_replaces_the_contents():
+    counter = LocationFrequencyCounter()
+    counter.record('1 Busy Street', 'Others')
+    counter.rebuild([('2 Quiet Street', 'Others', datetime.utcnow())])
+
+    assert counter.count('1 Busy Street', 'Others') == 0
+    assert counter.count('2 Quiet Street', 'Others') == 1
+    assert len(counter._expiry) == 1
@@ -0,0 +1,58 @@
+"""
+Prometheus metrics and the /metrics endpoint
+"""
+from metrics import MetricsRegistry
+
+def test_render_types():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ['method'])
+    requests.inc(method='GET')
+    registry.callback_counter('hits_total', 'Hits', lambda: 7)
+    registry.gauge('queue_pending', 'Queued', lambda: 2)
+
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests', '# TYPE requests_total counter', 'requests_total{method="GET"} 1',
+        '# HELP hits_total Hits', '# TYPE hits_total counter', 'hits_total 7',
+        '# HELP queue_pending Queued', '# TYPE queue_pending gauge', 'queue_pending 2'
+    ]
+
+def test_metrics_only_for_allowed_clients(app_db, monkeypatch):
+    from app import app
+
+    client = app.test_client()
+    local = client.get('/metrics', environ_base={'REMOTE_ADDR': '127.0.0.1'})
+    assert local.status_code == 200
+    assert '# TYPE prediction_cache_hits_total counter' in local.get_data(as_text=True)
+
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.5'}).status_code == 403
+
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'scrape-secret')
+    remote = {'REMOTE_ADDR': '203.0.113.5'}
+    assert client.get('/metrics', environ_base=remote,
+                      headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+    assert client.get('/metrics', environ_base=remote,
+                      headers={'Authorization': 'Bearer wrong'}).status_code == 403
+
+def test_proxied_metrics_need_the_token_without_proxy_fix(app_db, monkeypatch):
+    from app import app
+
+    client = app.test_client()
+    # A local reverse proxy forwarding an outside client
+    proxied = {'environ_base': {'REMOTE_ADDR': '127.0.0.1'}, 'headers': {'X-Forwarded-For': '203.0.113.5'}}
+    assert client.get('/metrics', **proxied).status_code == 403
+
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'scrape-secret')
+    proxied['headers']['Authorization'] = 'Bearer scrape-secret'
+    assert client.get('/metrics', **proxied).status_code == 200
+
+def test_proxy_fix_uses_the_forwarded_client_address(app_db, monkeypatch):
+    from werkzeug.middleware.proxy_fix import ProxyFix
+    from app import app
+
+    monkeypatch.setitem(app.config, 'PROXY_COUNT', 1)
+    monkeypatch.setattr(app, 'wsgi_app', ProxyFix(app.wsgi_app, x_for=1))
+    client = app.test_client()
+
+    local = {'REMOTE_ADDR': '127.0.0.1'}
+    assert client.get('/metrics', environ_base=local, headers={'X-Forwarded-For': '203.0.113.5'}).status_code == 403
+    assert client.get('/metrics', environ_base=local, headers={'X-Forwarded-For': '127.0.0.1'}).status_code == 200
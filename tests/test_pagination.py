@@ -0,0 +1,84 @@
+"""
+Keyset pagination of the request listings
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+def add_requests(db, rows):
+    from app import ServiceRequest
+
+    start = datetime(2026, 10, 1)
+    for i, (priority, confidence, category) in enumerate(rows):
+        db.session.add(ServiceRequest(location=f'{i} Main Street', category=category, description='Broken light',
+                                      ml_priority=priority, ml_confidence=confidence,
+                                      created_at=start + timedelta(minutes=i % 4)))
+    db.session.commit()
+
+def all_pages(sort_by, per_page):
+    from app import ServiceRequest, paginate_requests
+
+    ids, cursor = [], None
+    while True:
+        rows, cursor = paginate_requests(ServiceRequest.query, sort_by, cursor=cursor, per_page=per_page)
+        ids.extend(row.id for row in rows)
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize('sort_by', ['date', 'priority', 'category', 'location'])
+@pytest.mark.parametrize('per_page', [1, 2, 3, 100])
+def test_pages_cover_every_row_once(app_db, sort_by, per_page):
+    from app import SCORING_PRIORITY, ServiceRequest, paginate_requests
+
+    add_requests(app_db, [(SCORING_PRIORITY, None, 'Road damage')] * 5 +
+                         [('High', 0.9, 'Waste collection'), ('High', 0.9, 'Road damage'),
+                          ('Low', 0.4, 'Road damage'), ('Medium', None, 'Others')])
+
+    expected, _ = paginate_requests(ServiceRequest.query, sort_by, per_page=100)
+    assert all_pages(sort_by, per_page) == [row.id for row in expected]
+    assert len(expected) == 9
+
+def test_scoring_rows_sort_after_scored_rows(app_db):
+    from app import SCORING_PRIORITY
+
+    add_requests(app_db, [(SCORING_PRIORITY, None, 'Others'), ('Low', 0.2, 'Others'),
+                          ('High', None, 'Others'), ('High', 0.7, 'Others')])
+
+    assert all_pages('priority', 2) == [4, 3, 2, 1]
+
+@pytest.mark.parametrize('priority_filter, expected', [
+    ('High', [4, 3]), ('Low', [2]), ('Scoring', [1]), ('', [4, 3, 2, 1]), ('high', []), ('Urgent', [])
+])
+def test_priority_filter(app_db, priority_filter, expected):
+    from app import SCORING_PRIORITY, filter_requests, paginate_requests
+
+    add_requests(app_db, [(SCORING_PRIORITY, None, 'Others'), ('Low', 0.2, 'Others'),
+                          ('High', None, 'Others'), ('High', 0.7, 'Others')])
+
+    rows, _ = paginate_requests(filter_requests(priority_filter), 'priority')
+    assert [row.id for row in rows] == expected
+
+@pytest.mark.parametrize('sort_by, values', [
+    ('date', [123, 1]),
+    ('date', ['yesterday', 1]),
+    ('location', [{'a': 1}, 1]),
+    ('location', [['a'], 1]),
+    ('category', ['Others', 5, 1]),
+    ('category', [7, '2026-10-01T00:00:00', 1]),
+    ('priority', [2, 'high', 1]),
+    ('priority', [2, 0.5, True]),
+    ('priority', [2, 0.5]),
+    ('date', {'created_at': None})
+])
+def test_malformed_cursor_is_rejected(app_db, sort_by, values):
+    from app import app, encode_cursor
+
+    response = app.test_client().get('/api/requests', query_string={'sort': sort_by, 'cursor': encode_cursor(values)})
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Invalid cursor'}
+
+def test_cursor_that_is_not_base64_json_is_rejected(app_db):
+    from app import app
+
+    response = app.test_client().get('/api/requests', query_string={'cursor': 'not a cursor'})
+    assert response.status_code == 400
@@ -0,0 +1,29 @@
+"""
+Batch priority prediction API
+"""
+def test_rejects_batches_over_the_limit(app_db, monkeypatch):
+    from app import app, ml_predictor
+
+    def predict(records):
+        return [{'priority': 'Low', 'confidence': 0.5, 'explanation': 'Test', 'matched_keywords': {}}
+                for _ in records]
+
+    monkeypatch.setattr(ml_predictor, 'predict_priority_batch', predict)
+    monkeypatch.setitem(app.config, 'PREDICT_BATCH_MAX_ITEMS', 3)
+    client = app.test_client()
+    record = {'category': 'Others', 'description': 'General inquiry'}
+
+    response = client.post('/api/predict/batch', json={'requests': [record] * 3})
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 3
+
+    response = client.post('/api/predict/batch', json=[record] * 4)
+    assert response.status_code == 413
+    assert response.get_json()['success'] is False
+
+def test_rejects_malformed_payloads(app_db):
+    from app import app
+
+    client = app.test_client()
+    assert client.post('/api/predict/batch', json={'requests': 'nope'}).status_code == 400
+    assert client.post('/api/predict/batch', json=[1, 2]).status_code == 400
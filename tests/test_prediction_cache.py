@@ -0,0 +1,44 @@
+"""
+Cache of predictions for repeated complaints
+"""
+import pytest
+
+from prediction_cache import PredictionCache
+
+def test_key_keeps_whitespace_and_category_case():
+    key = PredictionCache.key
+    assert key('Others', 'No light here', 'v1') == key('Others', 'no LIGHT here', 'v1')
+    assert key('Others', 'No light here', 'v1') != key('Others', 'No  light here', 'v1')
+    assert key('Others', 'No light here', 'v1') != key('others', 'No light here', 'v1')
+    assert key('Others', 'No light here', 'v1') != key('Others', 'No light here', 'v2')
+
+@pytest.fixture
+def predictor(tmp_path, monkeypatch):
+    from ml_model import MLPriorityPredictor
+
+    # Models are saved under ./models; train a small one from the sample data
+    monkeypatch.chdir(tmp_path)
+    predictor = MLPriorityPredictor(training_params={'n_estimators': 10, 'n_jobs': 1},
+                                    prediction_cache=PredictionCache())
+    predictor.ensure_model()
+    return predictor
+
+def test_cached_results_are_independent_copies(predictor):
+    record = {'category': 'Streetlight issue', 'description': 'Dangerous dark corner, no light'}
+    first, = predictor.predict_priority_batch([record])
+    first['matched_keywords']['High'].append('changed')
+    first['priority'] = 'changed'
+
+    second, = predictor.predict_priority_batch([record])
+    assert predictor.prediction_cache.hits == 1
+    assert 'changed' not in second['matched_keywords']['High']
+    assert second['priority'] != 'changed'
+
+def test_whitespace_variants_keep_their_own_explanation(predictor):
+    single = {'category': 'Streetlight issue', 'description': 'There is no light here'}
+    double = {'category': 'Streetlight issue', 'description': 'There is no  light here'}
+    first, = predictor.predict_priority_batch([single])
+    second, = predictor.predict_priority_batch([double])
+
+    assert 'no light' in first['matched_keywords']['High']
+    assert 'no light' not in second['matched_keywords']['High']
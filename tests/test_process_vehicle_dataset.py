@@ -0,0 +1,70 @@
+"""
+Parity of the chunked, vectorized process_raw_data with the row-by-row
+implementation it replaced
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from process_vehicle_dataset import DAYS_PARKED_COLUMN, process_chunk_rows, process_raw_data
+
+def raw_rows(n_rows, seed, text_days_from):
+    """Raw complaint rows with gaps, and text day counts only after text_days_from"""
+    rng = random.Random(seed)
+
+    def maybe(value, missing=0.15):
+        return '' if rng.random() < missing else value
+
+    rows = []
+    for i in range(n_rows):
+        days = rng.choice([0, 3, 7, 29, 30, 59, 60, 120])
+        if i >= text_days_from and rng.random() < 0.5:
+            days = rng.choice([f'{days} days', 'unknown', f'about {days}'])
+        rows.append({
+            'Service Request Number': maybe(f'SR-{i:06d}'),
+            'Vehicle Make/Model': maybe(rng.choice(['Ford', 'Honda', 'Toyota'])),
+            'Vehicle Color': maybe(rng.choice(['Red', 'Blue', 'White'])),
+            'License Plate': maybe(rng.choice(['ABC123', 'XYZ789', '123456'])),
+            DAYS_PARKED_COLUMN: maybe(days, missing=0.1),
+            'Current Activity': maybe(rng.choice(['FVI - Outcome', 'Tow Requested', 'Final Outcome'])),
+            'Most Recent Action': maybe(rng.choice(['Create Work Order', 'Emergency tow', 'Vehicle Removed'])),
+            'Street Address': maybe(f'{rng.randint(1, 9999)} N Clark St'),
+            'ZIP Code': maybe(rng.choice([60601, 60614, 60657])),
+            'Ward': maybe(rng.randint(1, 50)),
+            'Unused Column': rng.random()
+        })
+    return pd.DataFrame(rows)
+
+@pytest.mark.parametrize('text_days_from', [0, 25, 10000])
+@pytest.mark.parametrize('chunk_size', [1, 7, 50, 100000])
+def test_matches_row_implementation(tmp_path, chunk_size, text_days_from):
+    input_file = tmp_path / 'raw.csv'
+    raw_rows(120, seed=text_days_from, text_days_from=text_days_from).to_csv(input_file, index=False)
+
+    # The original row-by-row implementation over the whole file, with the
+    # columns read as text like process_raw_data reads them
+    process_chunk_rows(pd.read_csv(input_file, dtype=str)).to_csv(tmp_path / 'expected.csv', index=False)
+    assert process_raw_data(str(input_file), str(tmp_path / 'actual.csv'), chunk_size=chunk_size) == 120
+
+    assert (tmp_path / 'actual.csv').read_text() == (tmp_path / 'expected.csv').read_text()
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 100000])
+def test_values_are_written_as_in_the_file(tmp_path, chunk_size):
+    input_file = tmp_path / 'raw.csv'
+    input_file.write_text(
+        f'Street Address,ZIP Code,Ward,"{DAYS_PARKED_COLUMN}",Current Activity\n'
+        '1 N Clark St,60601,42,30,FVI - Outcome\n'
+        '2 N Clark St,,,,\n'
+        '3 N Clark St,60657,1,about 61 days,Tow Requested\n'
+    )
+
+    process_raw_data(str(input_file), str(tmp_path / 'processed.csv'), chunk_size=chunk_size)
+    processed = pd.read_csv(tmp_path / 'processed.csv', dtype=str)
+
+    assert processed['location'].tolist() == ['1 N Clark St, ZIP 60601, Ward 42', '2 N Clark St',
+                                              '3 N Clark St, ZIP 60657, Ward 1']
+    assert processed['description'].tolist() == ['Reported parked for 30 days. Status: FVI - Outcome',
+                                                 'Abandoned vehicle complaint',
+                                                 'Reported parked for about 61 days days. Status: Tow Requested']
+    assert processed['priority'].tolist() == ['Medium', 'Low', 'High']
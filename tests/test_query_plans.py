@@ -0,0 +1,84 @@
+"""
+EXPLAIN QUERY PLAN checks that the listing, filter and count queries read
+service_request through an index rather than a full table scan, and that
+pages are read in index order without a sort
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+FILTERS = [
+    {},
+    {'priority_filter': 'High'},
+    {'category_filter': 'Road damage'},
+    {'status_filter': 'Pending'},
+    {'today_only': True},
+    {'category_filter': 'Road damage', 'today_only': True}
+]
+
+@contextmanager
+def captured_queries(db):
+    """Collect the (statement, parameters) of the SELECTs executed inside the block"""
+    queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            queries.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        yield queries
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+def query_plan(db, statement, parameters):
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    return [row[-1] for row in rows]
+
+def assert_uses_index(plan):
+    steps = [step for step in plan if 'service_request' in step]
+    assert steps, plan
+    for step in steps:
+        assert 'INDEX' in step, plan
+
+@pytest.mark.parametrize('sort_by', ['date', 'priority', 'category', 'location'])
+@pytest.mark.parametrize('with_cursor', [False, True])
+def test_listing_pages_read_sort_index(app_db, sort_by, with_cursor):
+    from app import SORT_ORDERS, encode_cursor, filter_requests, paginate_requests
+
+    sample = {'created_at': datetime(2026, 10, 1), 'id': 10, 'priority_rank': 2, 'category': 'Others',
+              'location': '1 Main Street'}
+    columns, _ = SORT_ORDERS[sort_by]
+    cursor = encode_cursor([sample.get(getattr(col, 'key', None), 0.5) for col in columns]) if with_cursor else None
+
+    with captured_queries(app_db) as queries:
+        paginate_requests(filter_requests(), sort_by, cursor=cursor, per_page=10)
+
+    plan = query_plan(app_db, *queries[-1])
+    assert_uses_index(plan)
+    assert not any('TEMP B-TREE' in step for step in plan), plan
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_filtered_listing_uses_index(app_db, filters):
+    from app import filter_requests, paginate_requests
+
+    with captured_queries(app_db) as queries:
+        paginate_requests(filter_requests(**filters), 'date', per_page=10)
+
+    assert_uses_index(query_plan(app_db, *queries[-1]))
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_priority_counts_use_index(app_db, filters):
+    from app import count_by_priority, filter_requests
+
+    with captured_queries(app_db) as queries:
+        count_by_priority(filter_requests(**filters))
+
+    plan = query_plan(app_db, *queries[-1])
+    assert_uses_index(plan)
+    if set(filters) == {'category_filter'}:
+        # Only the matching category is read, not the whole priority index
+        assert any('ix_service_request_category_priority_rank (category=?)' in step for step in plan), plan
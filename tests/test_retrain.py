@@ -0,0 +1,53 @@
+"""
+Background retraining jobs
+"""
+import time
+
+def poll_job(client, status_url, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(status_url).get_json()
+        if job['status'] != 'running':
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'{status_url} was still running after {timeout}s')
+
+def test_retrain_job_runs_to_completion(app_db, tmp_path, monkeypatch):
+    from app import app, ml_predictor
+    from synthetic_data import generate_requests
+
+    # The new model bundle is saved under ./models
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'models').mkdir()
+    dataset_path = str(tmp_path / 'dataset.csv')
+    generate_requests(500, seed=1)[['category', 'description', 'location', 'priority']].to_csv(dataset_path, index=False)
+    client = app.test_client()
+
+    response = client.post('/admin/retrain_model', json={'dataset_path': dataset_path,
+                                                         'training_params': {'n_estimators': 10, 'n_jobs': 1}})
+    assert response.status_code == 202
+    job = poll_job(client, response.get_json()['status_url'])
+
+    assert job['status'] == 'succeeded', job
+    assert 0 <= job['accuracy'] <= 1
+    assert job['model_version'] == ml_predictor.model_version
+    assert job['training_params']['n_estimators'] == 10
+
+def test_missing_dataset_is_rejected(app_db):
+    from app import app
+
+    response = app.test_client().post('/admin/retrain_model', json={'dataset_path': '/nonexistent/dataset.csv'})
+    assert response.status_code == 400
+
+def test_only_the_last_finished_jobs_are_kept(monkeypatch):
+    from app import app, prune_retrain_jobs, retrain_jobs
+
+    monkeypatch.setitem(app.config, 'RETRAIN_JOBS_KEPT', 2)
+    retrain_jobs.clear()
+    for job_id, status in [('a', 'failed'), ('b', 'succeeded'), ('c', 'running'), ('d', 'succeeded')]:
+        retrain_jobs[job_id] = {'job_id': job_id, 'status': status}
+
+    prune_retrain_jobs()
+
+    assert list(retrain_jobs) == ['b', 'c', 'd']
+    retrain_jobs.clear()
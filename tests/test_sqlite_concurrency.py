@@ -0,0 +1,68 @@
+"""
+Concurrent writers and readers on the file-backed SQLite database in WAL mode
+"""
+import threading
+
+WRITERS = 8
+READERS = 4
+WRITES_PER_WRITER = 25
+
+def test_pragmas_are_applied(app_db):
+    from app import app
+
+    with app_db.engine.connect() as conn:
+        assert conn.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+        assert conn.exec_driver_sql('PRAGMA busy_timeout').scalar() == app.config['SQLITE_PRAGMAS']['busy_timeout']
+        assert conn.exec_driver_sql('PRAGMA synchronous').scalar() == 1  # NORMAL
+
+def test_concurrent_writers_and_readers(app_db, monkeypatch):
+    import app
+
+    def predict(records):
+        return [{'priority': 'Medium', 'confidence': 0.6, 'explanation': 'Test', 'matched_keywords': {}}
+                for _ in records]
+
+    monkeypatch.setattr(app.ml_predictor, 'predict_priority_batch', predict)
+    client = app.app.test_client()
+    errors = []
+    writers_done = threading.Event()
+    start = threading.Barrier(WRITERS + READERS)
+
+    def write(worker):
+        start.wait()
+        for i in range(WRITES_PER_WRITER):
+            try:
+                response = client.post('/submit', data={'location': f'{worker} Main Street', 'category': 'Others',
+                                                        'description': f'Report {i}'})
+                assert response.status_code == 200, response.get_data(as_text=True)
+                request_id = response.get_json()['request_id']
+                response = client.post(f'/request/{request_id}/update_status', json={'status': 'In-Progress'})
+                assert response.status_code == 200, response.get_data(as_text=True)
+            except Exception as e:
+                errors.append(repr(e))
+
+    def read():
+        start.wait()
+        while not writers_done.is_set():
+            for url in ['/api/requests?sort=priority', '/api/requests?status=In-Progress', '/api/stats']:
+                try:
+                    response = client.get(url)
+                    assert response.status_code == 200, response.get_data(as_text=True)
+                except Exception as e:
+                    errors.append(repr(e))
+
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(WRITERS)]
+    readers = [threading.Thread(target=read) for _ in range(READERS)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_done.set()
+    for thread in readers:
+        thread.join()
+
+    assert not [error for error in errors if 'database is locked' in error]
+    assert errors == []
+    total = WRITERS * WRITES_PER_WRITER
+    assert app.ServiceRequest.query.count() == total
+    assert app.ServiceRequest.query.filter_by(status='In-Progress').count() == total
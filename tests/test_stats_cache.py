@@ -0,0 +1,38 @@
+"""
+Incrementally maintained dashboard statistics
+"""
+from stats_cache import StatsCache
+
+ROWS = [('Pending', 'Road damage', 'High', 3), ('Completed', 'Others', 'Low', 2)]
+
+def test_counters_follow_changes():
+    cache = StatsCache(lambda: ROWS)
+    cache.rebuild()
+    cache.record_insert('Pending', 'Others', 'Medium')
+    cache.record_status_change('Pending', 'In-Progress')
+    cache.record_priority_change('Medium', 'High')
+
+    stats, _ = cache.get()
+    assert stats == {'total': 6, 'pending': 3, 'in_progress': 1, 'completed': 2,
+                     'categories': {'Road damage': 3, 'Others': 3},
+                     'priorities': {'High': 4, 'Low': 2}}
+
+def test_etag_depends_only_on_the_stats():
+    # Two worker processes, or one after a restart, with the same counts
+    first, second = StatsCache(lambda: ROWS), StatsCache(lambda: ROWS)
+    assert first.get()[1] == second.get()[1]
+
+    etag = first.get()[1]
+    first.record_status_change('Pending', 'Completed')
+    assert first.get()[1] != etag
+    first.record_status_change('Completed', 'Pending')
+    assert first.get()[1] == etag
+
+def test_api_stats_returns_not_modified(app_db):
+    from app import app
+
+    client = app.test_client()
+    etag = client.get('/api/stats').headers['ETag']
+
+    response = client.get('/api/stats', headers={'If-None-Match': etag})
+    assert response.status_code == 304
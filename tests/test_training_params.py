@@ -0,0 +1,32 @@
+"""
+Training parameters from the TRAIN_* environment variables
+"""
+import logging
+
+import pytest
+
+from ml_model import DEFAULT_TRAINING_PARAMS, resolve_training_params, training_params_from_env
+
+def test_valid_values_override_the_defaults():
+    params = training_params_from_env({'TRAIN_MODE': 'streaming', 'TRAIN_N_ESTIMATORS': '300',
+                                       'TRAIN_MAX_DEPTH': '20', 'TRAIN_N_JOBS': '-1', 'TRAIN_CHUNK_SIZE': ''})
+
+    assert params == {'mode': 'streaming', 'n_estimators': '300', 'max_depth': '20', 'n_jobs': '-1'}
+    resolved = resolve_training_params(params)
+    assert resolved['n_estimators'] == 300
+    assert resolved['max_depth'] == 20
+    assert resolved['chunk_size'] == DEFAULT_TRAINING_PARAMS['chunk_size']
+
+@pytest.mark.parametrize('env_var, value', [
+    ('TRAIN_N_ESTIMATORS', 'abc'), ('TRAIN_MAX_DEPTH', '0'), ('TRAIN_N_JOBS', '-2'),
+    ('TRAIN_MODE', 'gradient'), ('TRAIN_HASH_FEATURES', '1.5')
+])
+def test_malformed_values_fall_back_to_defaults(env_var, value, caplog):
+    with caplog.at_level(logging.WARNING, logger='ml_model'):
+        params = training_params_from_env({env_var: value, 'TRAIN_MAX_FEATURES': '500'})
+
+    assert params == {'max_features': '500'}
+    assert env_var in caplog.text
+
+def test_unrelated_variables_are_ignored():
+    assert training_params_from_env({'TRAINING': 'x', 'N_ESTIMATORS': '5'}) == {}
@@ -0,0 +1,134 @@
+"""
+Background triage worker pool.
+
+In async mode /submit stores a request unscored and hands its id to this
+pool; worker threads drain the queue in micro-batches and score each batch
+with a single model call. A failed batch is retried one request at a time,
+and requests that keep failing are handed to a failure callback.
+"""
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+class TriageWorker:
+    """Thread pool that scores queued request ids in micro-batches"""
+
+    def __init__(self, score_batch, num_workers=2, batch_size=32, batch_wait=0.05, max_attempts=3, on_failure=None):
+        """
+        Args:
+            score_batch: Callable taking a list of request ids and scoring them
+            num_workers: Number of worker threads
+            batch_size: Maximum number of requests scored per model call
+            batch_wait: Seconds to wait for more ids before scoring a partial batch
+            max_attempts: Times a request is scored on its own before giving up
+            on_failure: Callable taking a list of request ids that were given up on
+        """
+        self.score_batch = score_batch
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_attempts = max_attempts
+        self.on_failure = on_failure
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        # Failed attempts per request id, while it is being retried
+        self._attempts = {}
+
+    @property
+    def running(self):
+        return bool(self._threads)
+
+    def start(self):
+        """Start the worker threads; returns False if they were already running"""
+        with self._lock:
+            if self._threads:
+                return False
+            for i in range(self.num_workers):
+                thread = threading.Thread(target=self._run, name=f'triage-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            return True
+
+    def stop(self):
+        """Stop the worker threads after the queued requests are scored"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    def submit(self, request_id):
+        """Queue a request for scoring"""
+        self._queue.put(request_id)
+
+    def pending(self):
+        """Approximate number of queued requests"""
+        return self._queue.qsize()
+
+    def _next_batch(self):
+        """Block for one id, then collect more until the batch is full or batch_wait passes"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                request_id = self._queue.get(timeout=self.batch_wait)
+            except queue.Empty:
+                break
+            if request_id is None:
+                # Pass the stop signal on after this batch
+                self._queue.put(None)
+                break
+            batch.append(request_id)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if self._score(batch) or len(batch) == 1:
+                continue
+            # Score the requests of a failed batch one at a time, so one bad
+            # request cannot fail the others
+            for request_id in batch:
+                self._score([request_id])
+
+    def _score(self, batch):
+        """Score a batch; a single request that fails is retried. Returns whether it succeeded"""
+        try:
+            self.score_batch(batch)
+        except Exception:
+            logger.exception("Scoring triage batch of %d requests failed", len(batch))
+            if len(batch) == 1:
+                self._retry(batch[0])
+            return False
+        with self._lock:
+            for request_id in batch:
+                self._attempts.pop(request_id, None)
+        return True
+
+    def _retry(self, request_id):
+        """Requeue a request that failed on its own, or give up after max_attempts"""
+        with self._lock:
+            attempts = self._attempts.get(request_id, 0) + 1
+            if attempts < self.max_attempts:
+                self._attempts[request_id] = attempts
+            else:
+                self._attempts.pop(request_id, None)
+        if attempts < self.max_attempts:
+            self._queue.put(request_id)
+            return
+
+        logger.error("Giving up on triage request %s after %d attempts", request_id, attempts)
+        if self.on_failure is not None:
+            try:
+                self.on_failure([request_id])
+            except Exception:
+                # The request stays unscored and is requeued on restart
+                logger.exception("Marking triage request %s as failed did not succeed", request_id)